@@ -0,0 +1,121 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+# Follow-up questions that only make sense with the previous turns.
+CONTEXT_WORDS = re.compile(
+    r"\b(it|its|that|this|those|these|they|them|their|above|previous|earlier|same|"
+    r"more|else|also|again|another|former|latter)\b|\bwhat about\b|\bhow about\b"
+)
+
+
+def corpus_version(texts: Iterable[str]) -> str:
+    """Stable fingerprint of the indexed documents; cached answers are only reused within one version."""
+    digest = hashlib.sha1()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def is_context_dependent(question: str, chat_history) -> bool:
+    """True when the question likely refers back to earlier turns, so its answer must not be cached."""
+    if not chat_history:
+        return False
+    text = question.lower().strip()
+    return len(text.split()) < 4 or bool(CONTEXT_WORDS.search(text))
+
+
+class SemanticAnswerCache:
+    """
+    Answer cache keyed by corpus version + question embedding.
+    A lookup hits when a cached question for the same corpus has cosine similarity
+    >= threshold. Entries are evicted least-recently-used beyond max_entries and
+    expire after ttl_seconds.
+    """
+    def __init__(self, embeddings, threshold: float = 0.92, max_entries: int = 512, ttl_seconds: float = 6 * 3600):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def embed(self, question: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(question.strip().lower()), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expire(self, now: float):
+        expired = [key for key, entry in self.entries.items() if now - entry["created"] > self.ttl_seconds]
+        for key in expired:
+            del self.entries[key]
+
+    def lookup(self, version: str, vector: np.ndarray) -> Optional[str]:
+        with self._lock:
+            self._expire(time.time())
+            best_key, best_score = None, self.threshold
+            for key, entry in self.entries.items():
+                if entry["version"] != version:
+                    continue
+                score = float(np.dot(entry["vector"], vector))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(best_key)
+            self.hits += 1
+            return self.entries[best_key]["answer"]
+
+    def store(self, version: str, vector: np.ndarray, question: str, answer: str):
+        with self._lock:
+            self.entries[self._next_id] = {
+                "version": version,
+                "vector": vector,
+                "question": question,
+                "answer": answer,
+                "created": time.time(),
+            }
+            self._next_id += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, version: str, question: str, chat_history, compute: Callable[[], str]):
+        """
+        Returns (answer, cached). Context-dependent follow-ups bypass the cache entirely;
+        otherwise a hit skips compute() and a miss stores its result.
+        """
+        if is_context_dependent(question, chat_history):
+            with self._lock:
+                self.bypassed += 1
+            return compute(), False
+
+        vector = self.embed(question)
+        answer = self.lookup(version, vector)
+        if answer is not None:
+            return answer, True
+
+        answer = compute()
+        self.store(version, vector, question, answer)
+        return answer, False
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
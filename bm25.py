@@ -0,0 +1,78 @@
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; keeps things like 'sde-1' and 'lru' intact."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed list of documents, stored as an inverted index
+    (term -> {doc position: term frequency}). Positions match the vector store order.
+    """
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_lengths = []
+        self.postings = defaultdict(dict)
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], **kwargs) -> "BM25Index":
+        index = cls(**kwargs)
+        for pos, text in enumerate(texts):
+            tokens = tokenize(text)
+            index.doc_lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                index.postings[term][pos] = tf
+        return index
+
+    @property
+    def avg_length(self) -> float:
+        return sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+
+    def _idf(self, term: str) -> float:
+        n = len(self.doc_lengths)
+        df = len(self.postings.get(term, {}))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 10, ids: Optional[set] = None) -> List[Tuple[int, float]]:
+        """Returns up to k (position, score) pairs, optionally restricted to the given positions."""
+        avg = self.avg_length or 1.0
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for pos, tf in postings.items():
+                if ids is not None and pos not in ids:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[pos] / avg)
+                scores[pos] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "k1": self.k1,
+                "b": self.b,
+                "doc_lengths": self.doc_lengths,
+                "postings": {term: list(p.items()) for term, p in self.postings.items()},
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data["k1"], b=data["b"])
+        index.doc_lengths = data["doc_lengths"]
+        for term, items in data["postings"].items():
+            index.postings[term] = {int(pos): tf for pos, tf in items}
+        return index
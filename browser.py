@@ -0,0 +1,141 @@
+import json
+import os
+import shutil
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+# Requests blocked in lightweight mode: media/fonts plus analytics, ad and tracker hosts.
+# The scrapers only read text from the DOM, so none of these change what they extract.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.mp4", "*.webm",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+    "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*clarity.ms*",
+    "*moengage.com*", "*webengage.com*", "*branch.io*", "*sentry.io*",
+    "*newrelic.com*", "*nr-data.net*", "*amplitude.com*", "*mixpanel.com*",
+    "*segment.io*", "*segment.com*", "*linkedin.com/px*", "*bat.bing.com*",
+]
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0'
+
+# The performance log buffers every Network/Page event in chromedriver, so it is only
+# enabled when byte reporting is asked for.
+MEASURE_BYTES = os.environ.get("INTBUDDY_MEASURE_BYTES", "").lower() in ("1", "true", "yes")
+
+_driver_path = None
+_lock = threading.Lock()
+
+
+def set_chromedriver_path(path: str):
+    """Pins the chromedriver binary explicitly (e.g. for offline / airgapped hosts)."""
+    global _driver_path
+    with _lock:
+        _driver_path = path
+
+
+def chromedriver_path() -> str:
+    """
+    Resolves the chromedriver binary once per process and reuses it for every browser.
+    Order: set_chromedriver_path() / $CHROMEDRIVER_PATH, then webdriver_manager
+    (which may hit the network), then a chromedriver found on PATH.
+    """
+    global _driver_path
+    if _driver_path:
+        return _driver_path
+    with _lock:
+        if _driver_path:
+            return _driver_path
+        path = os.environ.get("CHROMEDRIVER_PATH")
+        if not path:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+            except Exception as e:
+                path = shutil.which("chromedriver")
+                if not path:
+                    raise RuntimeError(f"Could not resolve chromedriver: {e}") from e
+                print(f"webdriver_manager failed ({e}); using {path}")
+        _driver_path = path
+        return _driver_path
+
+
+def new_driver(options) -> webdriver.Chrome:
+    return webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+
+
+def lightweight_options(headless: str = '--headless=new', user_agent: str = DEFAULT_USER_AGENT,
+                        measure: bool = MEASURE_BYTES):
+    """
+    ChromeOptions for scraping: no images, GPU, extensions or background services.
+    With measure, the performance log is enabled so page_bytes() can report traffic.
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument(headless)
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--log-level=3')
+    options.add_argument(f'user-agent={user_agent}')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-background-networking')
+    options.add_argument('--disable-component-update')
+    options.add_argument('--disable-default-apps')
+    options.add_argument('--disable-sync')
+    options.add_argument('--mute-audio')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.default_content_setting_values.notifications': 2,
+    })
+    if measure:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def new_lightweight_driver(headless: str = '--headless=new', user_agent: str = DEFAULT_USER_AGENT,
+                           measure: bool = MEASURE_BYTES) -> webdriver.Chrome:
+    """Chrome with lightweight_options() and BLOCKED_URL_PATTERNS intercepted over CDP."""
+    driver = new_driver(lightweight_options(headless, user_agent, measure))
+    driver.measure_bytes = measure
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Could not enable request blocking: {e}")
+    return driver
+
+
+def page_bytes(driver):
+    """
+    Bytes received over the network since the last call, summed from the performance
+    log's Network.loadingFinished events (reading the log also clears it).
+    None when the driver was started without measure.
+    """
+    if not getattr(driver, "measure_bytes", False):
+        return None
+    total = 0
+    try:
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message.get('method') == 'Network.loadingFinished':
+                total += int(message['params'].get('encodedDataLength', 0))
+    except Exception:
+        return 0
+    return total
+
+
+def warm_up(launch_browser: bool = False):
+    """
+    Pre-launch hook: resolves the driver binary before any scraping starts so the first
+    page does not pay for it. With launch_browser, also starts and quits one headless
+    Chrome to warm the OS file cache.
+    """
+    chromedriver_path()
+    if launch_browser:
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless=new')
+        driver = new_driver(options)
+        driver.quit()
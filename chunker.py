@@ -0,0 +1,107 @@
+from data_preprocessor import (document_metadata, overview_lines, question_lines,
+                               round_extra_lines, round_header)
+
+# Chunk budget in approximate tokens (whitespace-separated words).
+MAX_CHUNK_TOKENS = 200
+CHUNK_OVERLAP_TOKENS = 30
+
+OVERVIEW_FIELDS = ("application_method", "eligibility", "preparation_duration", "topics", "tips", "resume_tips")
+
+
+def count_tokens(text: str) -> int:
+    """Cheap token estimate: whitespace-separated words."""
+    return len(text.split())
+
+
+def _split_oversized(unit: str, max_tokens: int, overlap: int) -> list:
+    """Splits a single unit that is larger than the budget into overlapping word windows."""
+    words = unit.split()
+    step = max(1, max_tokens - overlap)
+    return [" ".join(words[i:i + max_tokens]) for i in range(0, len(words), step)
+            if i == 0 or i + overlap < len(words)]
+
+
+def _pack(units: list, prefix: str, max_tokens: int, overlap: int) -> list:
+    """
+    Greedily packs text units into chunks of at most max_tokens (prefix included).
+    Trailing units worth up to `overlap` tokens are repeated at the start of the next chunk.
+    """
+    budget = max(1, max_tokens - count_tokens(prefix))
+    pieces = []
+    for unit in units:
+        if count_tokens(unit) > budget:
+            pieces.extend(_split_oversized(unit, budget, min(overlap, budget // 2)))
+        else:
+            pieces.append(unit)
+
+    chunks = []
+    current, size = [], 0
+    for piece in pieces:
+        tokens = count_tokens(piece)
+        if current and size + tokens > budget:
+            chunks.append(current)
+            carried, carried_size = [], 0
+            for prev in reversed(current):
+                prev_tokens = count_tokens(prev)
+                if carried_size + prev_tokens > overlap or carried_size + prev_tokens + tokens > budget:
+                    break
+                carried.insert(0, prev)
+                carried_size += prev_tokens
+            current, size = carried, carried_size
+        current.append(piece)
+        size += tokens
+    if current:
+        chunks.append(current)
+
+    return ["\n".join(([prefix] if prefix else []) + chunk).strip() for chunk in chunks]
+
+
+def _round_metadata(base: dict, r: dict, questions: list) -> dict:
+    meta = dict(base)
+    meta['rounds'] = [r.get('round_number')] if r.get('round_number') is not None else []
+    meta['difficulties'] = sorted({
+        q.get('difficulty', '').lower() for q in questions
+        if q.get('difficulty') and q.get('difficulty') != 'Unknown'
+    })
+    return meta
+
+
+def chunk_entries(json_data, max_tokens: int = MAX_CHUNK_TOKENS, overlap: int = CHUNK_OVERLAP_TOKENS):
+    """
+    Splits structured interviews into small retrieval chunks instead of one document per interview:
+    an overview chunk (application, preparation, tips; skipped when none were found) plus one chunk per round, and per group of
+    questions when a round exceeds the token budget.
+
+    Returns records shaped like data_preprocessor.json_to_records output. Each chunk's metadata
+    carries 'parent_id' (the entry's position in json_data, i.e. its index in json_to_documents
+    output) so callers can expand a hit back to the full interview.
+    """
+    records = []
+    for parent_id, entry in enumerate(json_data):
+        base = document_metadata(entry)
+        base['parent_id'] = parent_id
+
+        header = ""
+        if entry.get("company") or entry.get("role"):
+            header = overview_lines(entry)[0]
+
+        # An entry with no overview fields (e.g. GfG) would only give an all-"N/A" chunk
+        if any(entry.get(f) for f in OVERVIEW_FIELDS):
+            for text in _pack(overview_lines(entry), "", max_tokens, overlap):
+                records.append({'text': text, 'metadata': dict(base, chunk_type='overview')})
+
+        for r in entry.get("interview_rounds", []):
+            prefix = "\n".join(line for line in (header, round_header(r)) if line)
+            questions = r.get("questions", [])
+            units = ["\n".join(question_lines(i, q)) for i, q in enumerate(questions, 1)]
+            if not units and not r.get("notes"):
+                units = ["  No questions listed."]
+            units += round_extra_lines(entry, r)
+
+            texts = _pack(units, prefix, max_tokens, overlap)
+            chunk_type = 'round' if len(texts) == 1 else 'questions'
+            meta = _round_metadata(base, r, questions)
+            for text in texts:
+                records.append({'text': text, 'metadata': dict(meta, chunk_type=chunk_type)})
+
+    return records
@@ -0,0 +1,98 @@
+import os
+import time
+
+
+class ServiceClient:
+    """Thin HTTP client for service.py."""
+    def __init__(self, base_url: str, timeout: float = 120):
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        # One pooled session: polling reuses the same connection
+        self.http = requests.Session()
+
+    def _post(self, path: str, payload: dict) -> dict:
+        resp = self.http.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def start_scrape(self, company: str, role: str, pages: int) -> str:
+        return self._post("/scrape", {"company": company, "role": role, "pages": pages})["job_id"]
+
+    def start_index(self, corpus_id: str, session_id: str = None) -> str:
+        return self._post("/index", {"corpus_id": corpus_id, "session_id": session_id})["job_id"]
+
+    def start_pdf(self, corpus_id: str) -> str:
+        return self._post("/pdf", {"corpus_id": corpus_id})["job_id"]
+
+    def job(self, job_id: str) -> dict:
+        resp = self.http.get(f"{self.base_url}/jobs/{job_id}", timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def ask(self, index_id: str, session_id: str, question: str) -> dict:
+        """Raises KeyError, like Backend.ask, when the service no longer has the index."""
+        import requests
+
+        try:
+            return self._post("/ask", {"index_id": index_id, "session_id": session_id, "question": question})
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                raise KeyError(f"index {index_id} was evicted, build it again") from e
+            raise
+
+    def end_session(self, session_id: str):
+        self.http.delete(f"{self.base_url}/sessions/{session_id}", timeout=self.timeout)
+
+    def pdf(self, pdf_id: str) -> bytes:
+        resp = self.http.get(f"{self.base_url}/pdf/{pdf_id}", timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.content
+
+
+class LocalClient:
+    """Same interface as ServiceClient, backed by an in-process service.Backend."""
+    def __init__(self, backend=None):
+        if backend is None:
+            from service import Backend
+            backend = Backend(prewarm_top_n=int(os.environ.get("INTBUDDY_PREWARM_TOP_N", "0")))
+        self.backend = backend
+
+    def start_scrape(self, company: str, role: str, pages: int) -> str:
+        return self.backend.start_scrape(company, role, pages)["id"]
+
+    def start_index(self, corpus_id: str, session_id: str = None) -> str:
+        return self.backend.start_index(corpus_id, session_id)["id"]
+
+    def start_pdf(self, corpus_id: str) -> str:
+        return self.backend.start_pdf(corpus_id)["id"]
+
+    def job(self, job_id: str) -> dict:
+        return self.backend.job(job_id)
+
+    def ask(self, index_id: str, session_id: str, question: str) -> dict:
+        return self.backend.ask(index_id, session_id, question)
+
+    def end_session(self, session_id: str):
+        self.backend.end_session(session_id)
+
+    def pdf(self, pdf_id: str) -> bytes:
+        return self.backend.pdf(pdf_id)
+
+
+def wait_for_job(client, job_id: str, on_update=None, poll_interval: float = 0.5) -> dict:
+    """Polls a job until it finishes; on_update(job) is called on every poll."""
+    while True:
+        job = client.job(job_id)
+        if on_update:
+            on_update(job)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(poll_interval)
+
+
+def get_client(base_url: str = None):
+    """ServiceClient when INTBUDDY_SERVICE_URL (or base_url) is set, otherwise an in-process LocalClient."""
+    base_url = base_url or os.environ.get("INTBUDDY_SERVICE_URL")
+    return ServiceClient(base_url) if base_url else LocalClient()
@@ -3,27 +3,38 @@
 import pandas as pd
 import re
 import time
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
+from browser import new_lightweight_driver, page_bytes, warm_up
+from code360_http import fetch_interview_links_http, scrape_interview_details_http
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
+# Try plain HTTP extraction before launching a browser for each interview
+USE_HTTP_FAST_PATH = True
+# Fetch filtered listing pages by URL before clicking through the filters in a browser
+USE_HTTP_LISTING = True
+
+
 # Step 1: Fetch all interview links after applying filters
 def fetch_interview_links(company_to_filter, role_to_filter, pages_to_scrape):
     print("--- Step 1: Fetching interview links ---")
+    if USE_HTTP_LISTING:
+        start = time.time()
+        results = fetch_interview_links_http(company_to_filter, role_to_filter, pages_to_scrape)
+        if results:
+            print(f"✅ Found {len(results)} links from {pages_to_scrape} listing page(s) in {time.time() - start:.1f}s.")
+            return results
+        print("Filtered listing URLs returned no interviews; falling back to the browser.")
+    return fetch_interview_links_clickthrough(company_to_filter, role_to_filter, pages_to_scrape)
+
+
+def fetch_interview_links_clickthrough(company_to_filter, role_to_filter, pages_to_scrape):
+    """Applies the filters through the dropdowns and clicks through pagination one page at a time."""
     target_url = "https://www.naukri.com/code360/interview-experiences"
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--log-level=3')
-    options.add_argument('user-agent=Mozilla/5.0')
-
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = new_lightweight_driver(headless='--headless')
     wait = WebDriverWait(driver, 15)
     all_results = []
 
@@ -74,6 +85,9 @@ def fetch_interview_links(company_to_filter, role_to_filter, pages_to_scrape):
     except Exception as e:
         print(f"Error in fetch_interview_links: {e}")
     finally:
+        transferred = page_bytes(driver)
+        if transferred is not None:
+            print(f"Listing pages: {transferred / 1024:.0f} KB transferred")
         driver.quit()
         print(f"✅ Found {len(all_results)} links.")
         return all_results
@@ -83,12 +97,7 @@ def fetch_interview_links(company_to_filter, role_to_filter, pages_to_scrape):
 def scrape_interview_details(url):
     driver = None
     try:
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless=new')  # Use new headless mode
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--log-level=3')
-        options.add_argument('user-agent=Mozilla/5.0')
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        driver = new_lightweight_driver()  # New headless mode, images/fonts/trackers blocked
 
         driver.get(url)
         time.sleep(5)
@@ -167,6 +176,8 @@ def scrape_interview_details(url):
             except:
                 return None
 
+        transferred = page_bytes(driver)
+        print(f"Fetched {url}" + (f" ({transferred / 1024:.0f} KB transferred)" if transferred is not None else ""))
         return "\n".join(parts)
 
     except Exception as e:
@@ -181,7 +192,10 @@ def scrape_interview_details(url):
 def scrape_link_wrapper(item, company_to_filter, role_to_filter_input):
     url = item.get('url') or item.get('URL')
     title = item.get('title') or item.get('Title')
-    description = scrape_interview_details(url)
+    description = scrape_interview_details_http(url) if USE_HTTP_FAST_PATH else None
+    if not description:
+        # Fall back to the browser when the page needs JavaScript to render
+        description = scrape_interview_details(url)
 
     if description:
         try:
@@ -197,6 +211,7 @@ def scrape_link_wrapper(item, company_to_filter, role_to_filter_input):
 def main(company_to_filter, role_to_filter_input, pages_to_scrape):
     role_to_filter = re.sub(r'\s*-\s*', ' - ', role_to_filter_input).upper()
     pages_to_scrape = max(1, int(pages_to_scrape))
+    warm_up()
 
     # Step 1: Get links
     links_to_process = fetch_interview_links(company_to_filter, role_to_filter, pages_to_scrape)
@@ -241,6 +256,7 @@ def main_generator(company_to_filter, role_to_filter_input, pages_to_scrape):
     except (ValueError, TypeError):
         pages_to_scrape = 1
 
+    warm_up()
     links_to_process = fetch_interview_links(company_to_filter, role_to_filter, pages_to_scrape)
 
     if not links_to_process:
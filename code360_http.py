@@ -0,0 +1,253 @@
+import html
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import requests
+from bs4 import BeautifulSoup
+
+# Same selectors the Selenium scraper reads (see code360.scrape_interview_details)
+JOURNEY_SELECTOR = "#ie-overall-user-experience"
+ROUND_CONTAINER_BASE_ID = "interview-round-v2-"
+FALLBACK_SELECTOR = "div.blog-body-content"
+# The browser reads each problem's link by clicking this component's "try now" button.
+PROBLEM_COMPONENT = "codingninjas-interview-round-problem"
+PROBLEM_LINK_PATTERN = re.compile(r"/problems?/|/code360/problems")
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                  'Chrome/124.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Angular's TransferState escapes these in the embedded JSON of older builds.
+NG_STATE_ESCAPES = {"&q;": '"', "&s;": "'", "&l;": "<", "&g;": ">", "&a;": "&"}
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    """One keep-alive session per scraper thread."""
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+        _local.session.headers.update(HEADERS)
+    return _local.session
+
+
+def _html_text(fragment: str) -> str:
+    return BeautifulSoup(fragment, "html.parser").get_text("\n", strip=True)
+
+
+def _format_description(journey, rounds) -> str:
+    """Builds the same description layout the Selenium scraper produces."""
+    parts = []
+    if journey:
+        parts.append("## Interview Preparation Journey\n" + journey)
+    if rounds:
+        parts.append("\n\n## Interview Rounds")
+        for i, (text, links) in enumerate(rounds, 1):
+            links_string = ", ".join(links) if links else "null"
+            parts.append(f"\n\n### Round {i}\n{text}\n\n🔗 Problem Links: {links_string}")
+    return "\n".join(parts)
+
+
+def extract_from_dom(page_html: str):
+    """
+    Reads the server-rendered journey and round containers, if the page has them.
+    Returns None when the result would be incomplete, so the caller uses the browser:
+    a journey without rounds (rounds rendered by JavaScript) or a round whose problem
+    components carry no readable link.
+    """
+    soup = BeautifulSoup(page_html, "lxml")
+
+    journey_node = soup.select_one(JOURNEY_SELECTOR)
+    journey = journey_node.get_text("\n", strip=True) if journey_node else ""
+
+    rounds = []
+    round_index = 1
+    while (container := soup.find(id=f"{ROUND_CONTAINER_BASE_ID}{round_index}")) is not None:
+        links = []
+        for anchor in container.find_all("a", href=True):
+            href = anchor["href"]
+            if PROBLEM_LINK_PATTERN.search(href) and href not in links:
+                links.append(href if href.startswith("http") else f"https://www.naukri.com{href}")
+        if container.select_one(PROBLEM_COMPONENT) is not None and not links:
+            return None
+        rounds.append((container.get_text("\n", strip=True), links))
+        round_index += 1
+
+    if journey and not rounds:
+        return None
+    if rounds:
+        return _format_description(journey, rounds)
+
+    fallback = soup.select_one(FALLBACK_SELECTOR)
+    if fallback and fallback.get_text(strip=True):
+        return fallback.get_text("\n", strip=True)
+    return None
+
+
+def _transfer_state(page_html: str):
+    """Parses Angular's embedded TransferState JSON (<script id="serverApp-state"> / "ng-state")."""
+    soup = BeautifulSoup(page_html, "lxml")
+    script = soup.find("script", id=re.compile(r"(serverApp-state|ng-state)$"))
+    if not script or not script.string:
+        return None
+    raw = script.string
+    for escaped, char in NG_STATE_ESCAPES.items():
+        raw = raw.replace(escaped, char)
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def _strings(node) -> list:
+    return [value for d in _walk(node) for value in d.values() if isinstance(value, str) and value.strip()]
+
+
+def _has_problems(round_data: dict) -> bool:
+    return any(re.search(r"problems?$", k, re.IGNORECASE) and v for k, v in round_data.items())
+
+
+def extract_from_state(page_html: str):
+    """
+    Reads the interview from the embedded page data: the first object holding a list of
+    round objects, with its journey/experience text alongside. As with extract_from_dom,
+    returns None for a journey without rounds or a round with problems but no links.
+    """
+    state = _transfer_state(page_html)
+    if state is None:
+        return None
+
+    for node in _walk(state):
+        round_key = next((k for k, v in node.items()
+                          if re.search(r"rounds?$", k, re.IGNORECASE) and isinstance(v, list)
+                          and v and all(isinstance(r, dict) for r in v)), None)
+        if round_key is None:
+            continue
+
+        journey = ""
+        for key, value in node.items():
+            if isinstance(value, str) and re.search(r"experience|journey|preparation", key, re.IGNORECASE):
+                journey = _html_text(value)
+                break
+
+        rounds = []
+        for round_data in node[round_key]:
+            texts = [_html_text(s) if "<" in s else html.unescape(s) for s in _strings(round_data)]
+            links = [s for s in _strings(round_data) if s.startswith("http") and PROBLEM_LINK_PATTERN.search(s)]
+            text = "\n".join(t for t in texts if t and not t.startswith("http"))
+            if _has_problems(round_data) and not links:
+                return None
+            if text:
+                rounds.append((text, list(dict.fromkeys(links))))
+
+        if rounds:
+            return _format_description(journey, rounds)
+        return None
+    return None
+
+
+def scrape_interview_details_http(url, session=None, timeout: float = 20):
+    """
+    Fetches an interview page over plain HTTP and extracts it without a browser.
+    Returns the description string, or None when the page needs JavaScript to render.
+    """
+    try:
+        resp = (session or _session()).get(url, timeout=timeout)
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        print(f"HTTP fetch failed for {url}: {e}")
+        return None
+
+    return extract_from_dom(resp.text) or extract_from_state(resp.text)
+
+
+# --- Listing pages ---
+
+LISTING_URL = "https://www.naukri.com/code360/interview-experiences"
+CARD_LINK_SELECTOR = "codingninjas-interview-experience-card-v2 a.interview-exp-title"
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _norm(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", (text or "").lower()))
+
+
+def listing_url(company: str, role: str, page: int = 1) -> str:
+    """Filtered listing page for a company and role, e.g. .../interview-experiences/amazon?role=SDE+-+1&page=2"""
+    params = {"role": role}
+    if page > 1:
+        params["page"] = page
+    return f"{LISTING_URL}/{_slug(company)}?{urlencode(params)}"
+
+
+def extract_listing(page_html: str) -> list:
+    """Interview cards ({"title", "url"}) on a server-rendered listing page."""
+    soup = BeautifulSoup(page_html, "lxml")
+    cards = []
+    for anchor in soup.select(CARD_LINK_SELECTOR):
+        href, text = anchor.get("href"), anchor.get_text(" ", strip=True)
+        if href and text:
+            cards.append({"title": text, "url": href if href.startswith("http") else f"https://www.naukri.com{href}"})
+    return cards
+
+
+def _matches_filter(title: str, company: str, role: str) -> bool:
+    """Card titles read "Company | Role"; keeps cards the site returned despite ignoring a filter out."""
+    if "|" not in title:
+        return True
+    title_company, title_role = title.split("|", 1)
+    return _norm(company) in _norm(title_company) and _norm(role) in _norm(title_role)
+
+
+def _fetch_page(url, timeout: float = 20):
+    try:
+        resp = _session().get(url, timeout=timeout)
+        resp.raise_for_status()
+        return resp.text
+    except requests.RequestException as e:
+        print(f"HTTP fetch failed for {url}: {e}")
+        return None
+
+
+def fetch_interview_links_http(company: str, role: str, pages: int, max_workers: int = 10) -> list:
+    """
+    Fetches listing pages 1..pages in parallel from their filtered URLs, with no browser.
+    Returns the cards in page order, stopping at the first page without any; an empty list
+    means the listing is not server-rendered (or not filtered) and the caller should fall
+    back to the browser.
+    """
+    urls = [listing_url(company, role, page) for page in range(1, pages + 1)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+        page_htmls = list(executor.map(_fetch_page, urls))
+
+    results, seen = [], set()
+    for page, page_html in enumerate(page_htmls, 1):
+        cards = extract_listing(page_html) if page_html else []
+        if not cards:
+            if page < pages:
+                print(f"Page {page} has no interviews; stopping there.")
+            break
+        for card in cards:
+            if card["url"] not in seen and _matches_filter(card["title"], company, role):
+                seen.add(card["url"])
+                results.append(card)
+    return results
@@ -1,14 +1,77 @@
 import re
-import json
-from collections import defaultdict
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional
 
-import re
-from collections import defaultdict
-import json
 
-import re
-import json
-from collections import defaultdict
+# --- Records ---
+
+class _Record:
+    """
+    Dict-style access for the slotted records below, so code written against the old
+    per-interview dicts (entry.get('topics', []), q['title']) keeps working.
+    As with the old dicts, .get() returns the default for fields that were not found.
+    """
+    __slots__ = ()
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return getattr(self, key, None) is not None
+
+
+@dataclass(slots=True)
+class Question(_Record):
+    title: str
+    difficulty: str = 'Unknown'
+    approach: str = ''
+
+
+@dataclass(slots=True)
+class Round(_Record):
+    round_number: int
+    mode: Optional[str] = None
+    duration: Optional[str] = None
+    type: Optional[str] = None
+    questions: List[Question] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+    notes: Optional[str] = None
+
+
+@dataclass(slots=True)
+class InterviewEntry(_Record):
+    application_method: Optional[str] = None
+    eligibility: Optional[str] = None
+    preparation_duration: Optional[str] = None
+    topics: Optional[List[str]] = None
+    tips: Optional[List[str]] = None
+    resume_tips: Optional[List[str]] = None
+    interview_rounds: List[Round] = field(default_factory=list)
+    company: Optional[str] = None
+    role: Optional[str] = None
+
+
+def _group(pattern, text, flags=0):
+    """First capture group of pattern in text, stripped, or None (never keeps the Match)."""
+    match = re.search(pattern, text, flags)
+    return match.group(1).strip() if match else None
+
+
+def _intern(value):
+    """Interns short values that repeat across interviews (difficulty, mode, topics...)."""
+    return sys.intern(value) if value is not None else None
+
 
 def clean_and_structure(raw_text: str):
     entries = []
@@ -18,48 +81,45 @@ def clean_and_structure(raw_text: str):
         if not interview.strip():
             continue
         
-        data = defaultdict(lambda: None)
+        data = InterviewEntry()
         # Extract application method
-        match = re.search(r'Application process\nWhere: (.+)', interview)
-        if match:
-            data['application_method'] = match.group(1).strip()
-        
+        data.application_method = _intern(_group(r'Application process\nWhere: (.+)', interview))
+
         # Extract eligibility
-        match = re.search(r'Eligibility: ([^\n]+)', interview)
-        if match:
-            data['eligibility'] = match.group(1).strip()
+        data.eligibility = _intern(_group(r'Eligibility: ([^\n]+)', interview))
 
         # Extract preparation duration
-        match = re.search(r'Preparation\nDuration: ([^\n]+)', interview)
-        if match:
-            data['preparation_duration'] = match.group(1).strip()
+        data.preparation_duration = _intern(_group(r'Preparation\nDuration: ([^\n]+)', interview))
 
         # Extract preparation topics
-        match = re.search(r'Topics: ([^\n]+)', interview)
-        if match:
-            data['topics'] = [topic.strip() for topic in match.group(1).split(',')]
+        topics = _group(r'Topics: ([^\n]+)', interview)
+        if topics:
+            data.topics = [_intern(topic.strip()) for topic in topics.split(',')]
 
         # Extract tips
         tips = re.findall(r'Tip \d+: (.+)', interview)
         if tips:
-            data['tips'] = tips
+            data.tips = tips
 
         # Extract resume tips
         resume_tips = re.findall(r'Resume tip\n(?:Tip \d+: )?(.+?)(?=\n(?:Tip \d+:|$))', interview, flags=re.DOTALL)
         if resume_tips:
-            data['resume_tips'] = [tip.strip().replace('\n', ' ') for tip in resume_tips]
+            data.resume_tips = [tip.strip().replace('\n', ' ') for tip in resume_tips]
 
         # Extract rounds
         rounds = []
         round_blocks = re.findall(r'### Round (\d+)(.+?)(?=### Round \d+|$)', interview, flags=re.DOTALL)
         for round_num, round_text in round_blocks:
-            round_info = {
-                'round_number': int(round_num),
-                'mode': re.search(r'Mode[:\s]*([^\n]+)', round_text, re.IGNORECASE),
-                'duration': re.search(r'Duration[:\s]*([^\n]+)', round_text, re.IGNORECASE),
-                'type': None,
-                'questions': []
-            }
+            # Free-text rounds (GfG) keep their prose as notes; mode/duration are not read from it
+            notes = _group(r'Round notes\n([^\n]+)', round_text)
+            fields = re.sub(r'Round notes\n[^\n]*', '', round_text)
+            round_info = Round(
+                round_number=int(round_num),
+                mode=_intern(_group(r'Mode[:\s]*([^\n]+)', fields, re.IGNORECASE)),
+                duration=_intern(_group(r'Duration[:\s]*([^\n]+)', fields, re.IGNORECASE)),
+                links=re.findall(r'https?://[^\s,\)]+', round_text),
+                notes=notes,
+            )
 
             # Parse questions inside each round
             questions = re.findall(r'\d+\.\s+(.+?)\n(?:Easy|Moderate|Hard)', round_text)
@@ -67,20 +127,108 @@ def clean_and_structure(raw_text: str):
             approaches = re.findall(r'Problem approach\n(.+?)(?=\nSolve later|\n\d+\.\s|$)', round_text, re.DOTALL)
 
             for i in range(len(questions)):
-                q = {
-                    'title': questions[i].strip(),
-                    'difficulty': difficulties[i].strip() if i < len(difficulties) else 'Unknown',
-                    'approach': approaches[i].strip().replace('\n', ' ') if i < len(approaches) else ''
-                }
-                round_info['questions'].append(q)
+                round_info.questions.append(Question(
+                    title=questions[i].strip(),
+                    difficulty=_intern(difficulties[i].strip()) if i < len(difficulties) else 'Unknown',
+                    approach=approaches[i].strip().replace('\n', ' ') if i < len(approaches) else '',
+                ))
 
             rounds.append(round_info)
 
-        data['interview_rounds'] = rounds
-        entries.append(dict(data))
+        data.interview_rounds = rounds
+        entries.append(data)
 
     return entries
 
+def overview_lines(entry):
+    """Header, basic info and tips for one interview entry."""
+    lines = []
+
+    # Optional Header
+    company = entry.get("company")
+    role = entry.get("role")
+    if company or role:
+        header = []
+        if company:
+            header.append(f"Company: {company}")
+        if role:
+            header.append(f"Role: {role}")
+        lines.append(" | ".join(header))
+
+    # Basic Info
+    lines.append(f"Application Method: {entry.get('application_method', 'N/A')}")
+    lines.append(f"Eligibility: {entry.get('eligibility', 'N/A')}")
+    lines.append(f"Preparation Duration: {entry.get('preparation_duration', 'N/A')}")
+    topics = entry.get('topics', [])
+    lines.append(f"Topics Covered: {', '.join(topics) if topics else 'N/A'}")
+
+    # General Tips
+    tips = entry.get("tips", [])
+    if tips:
+        lines.append("\nGeneral Tips:")
+        for tip in tips:
+            lines.append(f"- {tip}")
+
+    # Resume Tips
+    resume_tips = entry.get("resume_tips", [])
+    if resume_tips:
+        lines.append("\nResume Tips:")
+        for tip in resume_tips:
+            lines.append(f"- {tip}")
+
+    return lines
+
+def round_header(r):
+    rnum = r.get("round_number", "N/A")
+    mode = r.get("mode", "N/A")
+    duration = r.get("duration", "N/A")
+    interview_date = r.get("interview_date", "N/A")
+    return f"Round {rnum} | Mode: {mode} | Duration: {duration} | Date: {interview_date}"
+
+def question_lines(i, q):
+    """Lines for the i-th (1-based) question of a round."""
+    lines = []
+    title = q.get("title", f"Question {i}")
+    difficulty = q.get("difficulty", "N/A")
+    approach = q.get("approach", "N/A")
+    link = q.get("try_link", "")
+
+    lines.append(f"  • {title} ({difficulty})" if difficulty != "N/A" else f"  • {title}")
+    if approach:
+        lines.append(f"    Approach: {approach}")
+    if link:
+        lines.append(f"    Link: {link}")
+    return lines
+
+def round_extra_lines(entry, r):
+    """Round notes, system design question and raw round links, if present."""
+    lines = []
+
+    if r.get("notes"):
+        lines.append(f"Notes: {r['notes']}")
+
+    # System Design Question (if present)
+    sdq = r.get("system_design_question")
+    if sdq and sdq.get("question"):
+        lines.append("System Design Question:")
+        lines.append(f"  Question: {sdq['question']}")
+        if sdq.get("approach"):
+            lines.append(f"  Approach: {sdq['approach']}")
+
+    # Round-level links (parsed by clean_and_structure, or found in the raw text of older dicts)
+    links_match = list(r.get("links", []))
+    raw_text = entry.get("raw", "")
+    round_number_str = f"### Round {r.get('round_number', 'N/A')}"
+    if not links_match and round_number_str in raw_text:
+        round_text = raw_text.split(round_number_str, 1)[1].split("### Round", 1)[0]
+        links_match = re.findall(r"https?://[^\s,\)]+", round_text)
+    if links_match:
+        lines.append("  Links:")
+        for l in links_match:
+            lines.append(f"    - {l}")
+
+    return lines
+
 def json_to_documents(json_data):
     """
     Converts structured interview JSON data into detailed human-readable documents.
@@ -89,39 +237,7 @@ def json_to_documents(json_data):
     documents = []
 
     for entry in json_data:
-        lines = []
-
-        # Optional Header
-        company = entry.get("company")
-        role = entry.get("role")
-        if company or role:
-            header = []
-            if company:
-                header.append(f"Company: {company}")
-            if role:
-                header.append(f"Role: {role}")
-            lines.append(" | ".join(header))
-
-        # Basic Info
-        lines.append(f"Application Method: {entry.get('application_method', 'N/A')}")
-        lines.append(f"Eligibility: {entry.get('eligibility', 'N/A')}")
-        lines.append(f"Preparation Duration: {entry.get('preparation_duration', 'N/A')}")
-        topics = entry.get('topics', [])
-        lines.append(f"Topics Covered: {', '.join(topics) if topics else 'N/A'}")
-
-        # General Tips
-        tips = entry.get("tips", [])
-        if tips:
-            lines.append("\nGeneral Tips:")
-            for tip in tips:
-                lines.append(f"- {tip}")
-
-        # Resume Tips
-        resume_tips = entry.get("resume_tips", [])
-        if resume_tips:
-            lines.append("\nResume Tips:")
-            for tip in resume_tips:
-                lines.append(f"- {tip}")
+        lines = overview_lines(entry)
 
         # Interview Rounds
         rounds = entry.get("interview_rounds", [])
@@ -129,51 +245,116 @@ def json_to_documents(json_data):
             lines.append("\nInterview Rounds:")
 
         for r in rounds:
-            rnum = r.get("round_number", "N/A")
-            mode = r.get("mode", "N/A")
-            duration = r.get("duration", "N/A")
-            interview_date = r.get("interview_date", "N/A")
-
-            lines.append(f"\nRound {rnum} | Mode: {mode} | Duration: {duration} | Date: {interview_date}")
+            lines.append("\n" + round_header(r))
 
             # Questions
             questions = r.get("questions", [])
             if questions:
                 lines.append("Questions:")
                 for i, q in enumerate(questions, 1):
-                    title = q.get("title", f"Question {i}")
-                    difficulty = q.get("difficulty", "N/A")
-                    approach = q.get("approach", "N/A")
-                    link = q.get("try_link", "")
-
-                    lines.append(f"  • {title} ({difficulty})" if difficulty != "N/A" else f"  • {title}")
-                    if approach:
-                        lines.append(f"    Approach: {approach}")
-                    if link:
-                        lines.append(f"    Link: {link}")
-            else:
+                    lines.extend(question_lines(i, q))
+            elif not r.get("notes"):
                 lines.append("  No questions listed.")
 
-            # System Design Question (if present)
-            sdq = r.get("system_design_question")
-            if sdq and sdq.get("question"):
-                lines.append("System Design Question:")
-                lines.append(f"  Question: {sdq['question']}")
-                if sdq.get("approach"):
-                    lines.append(f"  Approach: {sdq['approach']}")
-
-            # Round-level links (if exist in raw)
-            raw_text = entry.get("raw", "")
-            round_number_str = f"### Round {rnum}"
-            if round_number_str in raw_text:
-                round_text = raw_text.split(round_number_str, 1)[1].split("### Round", 1)[0]
-                links_match = re.findall(r"https?://[^\s,\)]+", round_text)
-                if links_match:
-                    lines.append("  Links:")
-                    for l in links_match:
-                        lines.append(f"    - {l}")
+            lines.extend(round_extra_lines(entry, r))
 
         documents.append("\n".join(lines).strip())
 
     return documents
 
+
+
+def structure_dataframe(df):
+    """
+    Runs clean_and_structure over each scraped row separately so every entry
+    keeps the company and role it was scraped for.
+    """
+    entries = []
+    for _, row in df.iterrows():
+        for entry in clean_and_structure(str(row.get('description', ''))):
+            entry['company'] = row.get('company')
+            entry['role'] = row.get('role')
+            entries.append(entry)
+    return entries
+
+def document_metadata(entry):
+    """
+    Builds the filterable metadata for one structured interview entry:
+    company, role, round numbers, question difficulties and topics.
+    String values are lowercased so they can be matched against queries.
+    """
+    rounds = entry.get('interview_rounds') or []
+    difficulties = {
+        q.get('difficulty', '').lower()
+        for r in rounds for q in r.get('questions', [])
+        if q.get('difficulty') and q.get('difficulty') != 'Unknown'
+    }
+    return {
+        'company': (entry.get('company') or '').strip().lower() or None,
+        'role': (entry.get('role') or '').strip().lower() or None,
+        'rounds': sorted({r.get('round_number') for r in rounds if r.get('round_number') is not None}),
+        'difficulties': sorted(difficulties),
+        'topics': sorted({t.lower() for t in (entry.get('topics') or []) if t}),
+    }
+
+def json_to_records(json_data):
+    """
+    Same documents as json_to_documents, paired with their metadata:
+    [{'text': ..., 'metadata': {...}}, ...]
+    """
+    texts = json_to_documents(json_data)
+    return [
+        {'text': text, 'metadata': document_metadata(entry)}
+        for text, entry in zip(texts, json_data)
+    ]
+
+
+# --- Memory benchmark ---
+
+def _synthetic_interview(i: int) -> str:
+    """One scraped-looking interview description with 3 rounds."""
+    rounds = []
+    for r in range(1, 4):
+        questions = "\n".join(
+            f"{q}. Problem {(i * 7 + r * 3 + q) % 500} on arrays and strings\n{('Easy', 'Moderate', 'Hard')[(i + q) % 3]}\n"
+            f"Problem approach\n" + "Use a hashmap and two pointers, then optimise the window. " * 2 + "\nSolve later"
+            for q in range(1, 3)
+        )
+        rounds.append(f"### Round {r}\nMode: {('Online', 'Offline')[r % 2]}\nDuration: {30 * r} minutes\n"
+                      f"{questions}\n🔗 Problem Links: https://www.naukri.com/code360/problems/p-{i}-{r}")
+    return ("## Interview Preparation Journey\nApplication process\nWhere: Campus\nEligibility: 7 CGPA\n"
+            "Preparation\nDuration: 3 months\nTopics: Arrays, Strings, DP, Graphs\n"
+            "Tip 1: Practice daily\nTip 2: Revise core subjects\n## Interview Rounds\n" + "\n".join(rounds))
+
+
+def memory_benchmark(n: int = 100000) -> dict:
+    """
+    Structures n synthetic interviews and reports tracemalloc peak and retained memory
+    (after the raw descriptions are dropped) for the structured corpus.
+    """
+    import gc
+    import time
+    import tracemalloc
+
+    raw = [_synthetic_interview(i) for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    entries = [entry for text in raw for entry in clean_and_structure(text)]
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    del raw
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"interviews": len(entries), "peak_mb": peak / 1e6, "retained_mb": retained / 1e6,
+            "bytes_per_interview": retained / max(1, len(entries)), "seconds": seconds}
+
+
+if __name__ == "__main__":
+    # python data_preprocessor.py [n_interviews]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    report = memory_benchmark(n)
+    print(f"{report['interviews']} interviews structured in {report['seconds']:.1f}s: "
+          f"peak {report['peak_mb']:.0f} MB, retained {report['retained_mb']:.0f} MB "
+          f"({report['bytes_per_interview']:.0f} bytes/interview)")
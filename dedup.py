@@ -0,0 +1,94 @@
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Universal hashing modulo a prime just above 2**32 keeps a * x inside uint64.
+MERSENNE_PRIME = np.uint64(4294967311)
+MAX_HASH = np.uint64(2 ** 32 - 1)
+
+
+def shingles(text: str, size: int = 5) -> set:
+    """Hashed word n-grams of the normalized text."""
+    words = re.findall(r"[a-z0-9]+", str(text).lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashed_shingles: set) -> np.ndarray:
+        if not hashed_shingles:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        x = np.fromiter(hashed_shingles, dtype=np.uint64, count=len(hashed_shingles))
+        return ((self.a[:, None] * x[None, :] + self.b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def near_duplicate_clusters(texts, threshold: float = 0.8, num_perm: int = 128, bands: int = 16) -> list:
+    """
+    Groups near-identical texts with MinHash + LSH banding. Only documents that share a
+    band bucket are compared, so the cost is roughly linear in the number of documents.
+    Returns a list of clusters (lists of positions), singletons included.
+    """
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm=num_perm)
+    signatures = [hasher.signature(shingles(t)) for t in texts]
+
+    buckets = defaultdict(list)
+    for pos, sig in enumerate(signatures):
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows].tobytes())].append(pos)
+
+    parent = list(range(len(signatures)))
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        first = members[0]
+        for other in members[1:]:
+            if _find(parent, first) == _find(parent, other):
+                continue
+            # Verify the LSH candidate with the estimated Jaccard similarity
+            if np.mean(signatures[first] == signatures[other]) >= threshold:
+                parent[_find(parent, other)] = _find(parent, first)
+
+    clusters = defaultdict(list)
+    for pos in range(len(signatures)):
+        clusters[_find(parent, pos)].append(pos)
+    return list(clusters.values())
+
+
+def dedup_dataframe(df: pd.DataFrame, text_column: str = "description", threshold: float = 0.8):
+    """
+    Drops near-duplicate interview experiences, keeping the longest text of each cluster
+    as its canonical representative. Returns (deduped_df, report).
+    """
+    if df is None or df.empty:
+        return df, {"input": 0, "output": 0, "duplicates": 0, "dedup_ratio": 0.0}
+
+    texts = df[text_column].fillna("").astype(str).tolist()
+    clusters = near_duplicate_clusters(texts, threshold=threshold)
+    keep = sorted(max(cluster, key=lambda pos: len(texts[pos])) for cluster in clusters)
+
+    deduped = df.iloc[keep].reset_index(drop=True)
+    report = {
+        "input": len(df),
+        "output": len(deduped),
+        "duplicates": len(df) - len(deduped),
+        "dedup_ratio": (len(df) - len(deduped)) / len(df),
+    }
+    return deduped, report
@@ -0,0 +1,123 @@
+from answer_cache import is_context_dependent
+from chunker import count_tokens
+
+SUMMARY_PROMPT_TEMPLATE = """
+Progressively summarize a conversation between a user and an interview-insights assistant.
+Extend the current summary with the new lines. Keep company names, round numbers,
+question titles and links; drop pleasantries. Stay under {max_words} words.
+
+Current summary:
+{summary}
+
+New lines:
+{new_lines}
+
+New summary:
+"""
+
+
+def _tokens(turns: list) -> int:
+    return sum(count_tokens(q) + count_tokens(a) for q, a in turns)
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    words = text.split()
+    if len(words) <= max_tokens:
+        return text
+    return " ".join(words[:max(0, max_tokens - 1)] + ["…"]) if max_tokens > 0 else ""
+
+
+class ChatHistoryManager:
+    """
+    Bounds the chat history sent to ConversationalRetrievalChain: the last few turns
+    verbatim plus an incrementally updated summary of older ones, within a token budget.
+    Standalone questions get no history at all, which lets the chain skip its
+    question-condensing LLM call.
+
+    The summary is updated lazily, in for_chain() for a follow-up question that needs
+    it, so recording a turn never waits on the LLM. Past max_pending unsummarized turns
+    the oldest are folded into the summary as plain text.
+    """
+    def __init__(self, llm=None, window_turns: int = 4, token_budget: int = 900,
+                 summary_tokens: int = 250, summarize_every: int = 2, max_pending: int = 12):
+        self.llm = llm
+        self.window_turns = window_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summarize_every = summarize_every
+        self.max_pending = max_pending
+        self.window = []
+        self.pending = []
+        self.summary = ""
+
+    def _window_tokens(self) -> int:
+        return _tokens(self.window)
+
+    def _summarize(self):
+        if not self.pending:
+            return
+        new_lines = "\n".join(f"Human: {q}\nAssistant: {a}" for q, a in self.pending)
+        if self.llm is not None:
+            prompt = SUMMARY_PROMPT_TEMPLATE.format(
+                max_words=self.summary_tokens,
+                summary=self.summary or "(empty)",
+                new_lines=new_lines,
+            )
+            try:
+                self.summary = self.llm.invoke(prompt.strip()).content.strip()
+            except Exception as e:
+                print(f"Warning: Could not update chat summary. Error: {e}")
+                self.summary = f"{self.summary}\n{new_lines}".strip()
+        else:
+            self.summary = f"{self.summary}\n{new_lines}".strip()
+        self._trim_summary()
+        self.pending = []
+
+    def _trim_summary(self):
+        words = self.summary.split()
+        if len(words) > self.summary_tokens:
+            self.summary = " ".join(words[-self.summary_tokens:])
+
+    def add_turn(self, question: str, answer: str):
+        """Records a finished turn, moving old turns out of the window to await summarizing (no LLM call)."""
+        self.window.append((question, answer))
+        window_budget = self.token_budget - self.summary_tokens
+        while len(self.window) > 1 and (len(self.window) > self.window_turns or self._window_tokens() > window_budget):
+            self.pending.append(self.window.pop(0))
+        while len(self.pending) > self.max_pending:
+            q, a = self.pending.pop(0)
+            self.summary = f"{self.summary}\nHuman: {q}\nAssistant: {a}".strip()
+            self._trim_summary()
+
+    def _fit(self, turns: list, budget: int) -> list:
+        """The newest turns that fit in budget tokens; the oldest one that does not fit is cut short."""
+        fitted = []
+        for q, a in reversed(turns):
+            if budget <= 0:
+                break
+            q = _clip(q, budget)
+            a = _clip(a, budget - count_tokens(q))
+            fitted.insert(0, (q, a))
+            budget -= count_tokens(q) + count_tokens(a)
+        return fitted
+
+    def for_chain(self, question: str) -> list:
+        """
+        Chat history to pass to the chain for this question (empty when it is standalone),
+        within token_budget. A follow-up first folds the pending turns into the summary, once
+        enough have built up or they do not fit; a turn still too long (e.g. a long list of
+        links) is cut short.
+        """
+        if not is_context_dependent(question, self.pending + self.window):
+            return []
+        turns_budget = self.token_budget - self.summary_tokens
+        if len(self.pending) >= self.summarize_every or _tokens(self.pending + self.window) > turns_budget:
+            self._summarize()
+        from langchain_core.messages import SystemMessage
+
+        history = []
+        if self.summary:
+            history.append(SystemMessage(content=f"Summary of the earlier conversation: {self.summary}"))
+        budget = self.token_budget - sum(count_tokens(m.content) for m in history)
+        history.extend(self._fit(self.pending + self.window, budget))
+        return history
@@ -0,0 +1,76 @@
+"""
+Import-time regression check for the app's cold start.
+
+Runs `python -X importtime` on what intbuddy2.py loads before the first user action
+(the client and the in-process backend), prints the slowest imports, and fails when
+a heavy dependency is imported eagerly or the total exceeds the budget.
+
+    python importtime_check.py [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+# What the Streamlit script pulls in at startup (minus streamlit itself).
+STARTUP_CODE = "import client; client.get_client()"
+
+# Must only be imported on first scrape / index / chat / PDF.
+HEAVY_MODULES = (
+    "langchain", "langchain_core", "langchain_community", "langchain_google_genai",
+    "google.generativeai", "faiss", "selenium", "webdriver_manager", "reportlab",
+    "pandas", "aiohttp",
+)
+
+LINE_PATTERN = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile(code: str) -> list:
+    """Returns [(module, self_us, cumulative_us, depth), ...] from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise SystemExit(f"Startup code failed: {code}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = profile(STARTUP_CODE)
+    total_ms = sum(r[2] for r in rows if r[3] == 0) / 1000
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+    print(f"\nTotal startup import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    imported = {r[0] for r in rows}
+    eager = sorted(m for m in imported if any(m == h or m.startswith(h + ".") for h in HEAVY_MODULES))
+    failed = False
+    if eager:
+        print("\n❌ Heavy modules imported at startup: " + ", ".join(eager))
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\n❌ Startup imports exceed the {args.budget_ms:.0f} ms budget.")
+        failed = True
+    if not failed:
+        print("\n✅ Startup imports are lazy and within budget.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,20 @@
 import streamlit as st
-import asyncio
 import os
-import pandas as pd
-from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
-from langchain_core.documents import Document
-from langchain_community.vectorstores import FAISS
-from langchain.chains import ConversationalRetrievalChain
-from data_preprocessor import clean_and_structure, json_to_documents
-from parser import structure_df
-from prompt import get_prompt
-from pdfgen import build_pdf
-# Correctly import the new generator function
-from code360 import main_generator as fetch_interview_data
+import uuid
+from client import get_client, wait_for_job
 
 os.environ["GOOGLE_API_KEY"] = st.secrets["GOOGLE_API_KEY"]
 
 
 # --- Main Application Logic ---
 
-# Ensure event loop exists for async operations
-try:
-    asyncio.get_running_loop()
-except RuntimeError:
-    asyncio.set_event_loop(asyncio.new_event_loop())
-
-# Cached function to get the LLM (this is correct)
-@st.cache_resource
-def get_llm():
-    return ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash",
-        temperature=0.3,
-        max_tokens=None,
-        timeout=None,
-        max_retries=2
-    )
-
-# Cached function to get the embedding model (this is correct)
+# One client per process. Scraping, indexing and PDF generation run in the service
+# (or an in-process backend when INTBUDDY_SERVICE_URL is not set), not in this script.
 @st.cache_resource
-def get_embeddings():
-    return GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+def get_service_client():
+    return get_client(st.secrets.get("INTBUDDY_SERVICE_URL"))
+
+client = get_service_client()
 
 # --- Streamlit Page UI ---
 
@@ -52,72 +28,59 @@ pages = st.number_input("Number of Pages to Scrape", min_value=1, max_value=10,
 # Initialize session state variables
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
-if "qa_chain" not in st.session_state:
-    st.session_state.qa_chain = None
+if "index_id" not in st.session_state:
+    st.session_state.index_id = None
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
 
-# --- CHANGE: This is the completely new logic for the button ---
 if st.button("Load & Build Chatbot"):
     # Placeholders for dynamic progress text
     info_placeholder = st.empty()
     progress_placeholder = st.empty()
-    df = None
+
+    def show_progress(job):
+        if job.get("current") is not None:
+            # Update the progress text, e.g., "Scraped 4/10"
+            progress_placeholder.text(f"Scraped {job['current']}/{job['total']}")
+        elif job.get("message"):
+            info_placeholder.info(job["message"])
 
     with st.spinner("Initializing scraper..."):
-        # Call the generator function
-        scraper_generator = fetch_interview_data(company, role, pages)
-
-        # Iterate through the yielded updates from the scraper
-        for result in scraper_generator:
-            if result.get('status') == 'info':
-                info_placeholder.info(result['message'])
-            elif result.get('status') == 'progress':
-                # Update the progress text, e.g., "Scraped 4/10"
-                progress_placeholder.text(f"Scraped {result['current']}/{result['total']}")
-            elif result.get('status') == 'complete':
-                # The final result is the DataFrame
-                df = result['data']
-                break # Exit loop once data is complete
+        scrape_job = wait_for_job(client, client.start_scrape(company, role, int(pages)), show_progress)
 
     # --- Process the data after scraping is finished ---
-    if df is not None and not df.empty:
+    result = scrape_job.get("result") or {}
+    if scrape_job["status"] == "done" and result.get("corpus_id"):
         # Clear the progress text and show a final message
         progress_placeholder.empty()
-        info_placeholder.info(f"Scraping complete. Processing {len(df)} experiences...")
+        info_placeholder.info(f"Scraping complete. Processing {result['count']} experiences...")
 
         with st.spinner("Embedding data and building chatbot..."):
-            # This logic was previously in the cached function
-            raw_text = df['description'].str.cat(sep=' ')
-            structured = clean_and_structure(raw_text)
-            chunks = json_to_documents(structured)
-            docs = [Document(page_content=chunk) for chunk in chunks]
-            embeddings = get_embeddings()
-            vs = FAISS.from_documents(docs, embeddings)
+            index_job = wait_for_job(client, client.start_index(result["corpus_id"], st.session_state.session_id))
 
+        if index_job["status"] == "done":
             # Store results in session state
-            st.session_state.df = df
+            st.session_state.corpus_id = result["corpus_id"]
+            st.session_state.index_id = index_job["result"]["index_id"]
             st.session_state.company = company
             st.session_state.role = role
-            custom_prompt = get_prompt()
-            st.session_state.qa_chain = ConversationalRetrievalChain.from_llm(
-                llm=get_llm(),
-                retriever=vs.as_retriever(search_kwargs={"k": 5}),
-                return_source_documents=True,
-                combine_docs_chain_kwargs={"prompt": custom_prompt}
-            )
-        st.success(f"Chatbot ready with {len(df)} interview experiences ✅")
-        st.balloons()
+            st.session_state.chat_history = []
+            st.success(f"Chatbot ready with {result['count']} interview experiences ✅")
+            st.balloons()
+        else:
+            st.error(f"Building the chatbot failed: {index_job.get('error')}")
         # Clear the info message for a clean UI
         info_placeholder.empty()
 
-    elif df is not None and df.empty:
+    elif scrape_job["status"] == "done":
         st.warning("Scraping finished, but no interview data was found for the given criteria.")
     else:
         st.error("Scraping failed to start or complete. Please check your inputs or the scraper function.")
 
 
-# --- Chat Interface and PDF Generation (These sections remain unchanged) ---
+# --- Chat Interface and PDF Generation ---
 
-if st.session_state.qa_chain:
+if st.session_state.index_id:
     # Display previous messages
     for user_q, bot_a in st.session_state.chat_history:
         st.chat_message("user").write(user_q)
@@ -126,38 +89,41 @@ if st.session_state.qa_chain:
     if prompt := st.chat_input("Ask a question"):
         if prompt.lower().strip() in ["exit", "quit", "bye"]:
             st.success("🧹 Ending session. Cache and chat history cleared.")
-            st.cache_resource.clear()
+            client.end_session(st.session_state.session_id)
             st.session_state.clear()
             st.rerun()
 
         st.chat_message("user").write(prompt)
         with st.spinner("Thinking..."):
-            result = st.session_state.qa_chain({
-                "question": prompt,
-                "chat_history": st.session_state.chat_history
-            })
-            answer = result["answer"]
+            try:
+                answer = client.ask(st.session_state.index_id, st.session_state.session_id, prompt)["answer"]
+            except KeyError:
+                # The index was evicted (idle sweep, memory limit) or the service restarted
+                answer = None
+        if answer is None:
+            st.session_state.index_id = None
+            st.warning("⚠️ This chatbot is no longer loaded. Please load it again.")
+        else:
             st.session_state.chat_history.append((prompt, answer))
             st.chat_message("assistant").write(answer)
 
     st.markdown("---")
     if st.button("📄 Generate PDF from Interviews"):
-        if "df" in st.session_state and st.session_state.df is not None:
+        if st.session_state.get("corpus_id"):
             with st.spinner("Generating PDF with summaries..."):
-                final_struct = structure_df(st.session_state.df)
-                llm = get_llm()
-                pdf_bytes = build_pdf(
-                    final_struct,
-                    llm,
-                    st.session_state.company,
-                    st.session_state.role
-                )
+                pdf_job = wait_for_job(client, client.start_pdf(st.session_state.corpus_id))
+            if pdf_job["status"] == "done":
                 st.success("PDF generated successfully! 📄")
+                if failed := pdf_job["result"].get("failed_sections"):
+                    st.warning(f"Some sections could not be summarized ({', '.join(failed)}). "
+                               "Generate the PDF again to retry just those sections.")
                 st.download_button(
                     "⬇️ Download PDF",
-                    data=pdf_bytes,
+                    data=client.pdf(pdf_job["result"]["pdf_id"]),
                     file_name="interview_summary.pdf",
                     mime="application/pdf"
                 )
+            else:
+                st.error(f"PDF generation failed: {pdf_job.get('error')}")
         else:
-            st.warning("Please load and build the chatbot first.")
\ No newline at end of file
+            st.warning("Please load and build the chatbot first.")
@@ -0,0 +1,278 @@
+import contextvars
+import hashlib
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from chunker import count_tokens
+
+# Lower runs first: interactive chat is never queued behind PDF summaries.
+PRIORITY_CHAT = 0
+PRIORITY_BATCH = 10
+PRIORITY_NAMES = {PRIORITY_CHAT: "chat", PRIORITY_BATCH: "batch"}
+
+TOKEN_WINDOW_SECONDS = 60
+
+# Who the current LLM call is for (a chat session id); set with user_scope().
+current_user = contextvars.ContextVar("llm_gateway_user", default=None)
+
+
+class GatewayBusyError(RuntimeError):
+    """Raised when a request waited longer than queue_timeout for a concurrency or token slot."""
+
+
+@contextmanager
+def user_scope(user):
+    """Attributes every gateway call made inside the block (in this thread) to user."""
+    token = current_user.set(user)
+    try:
+        yield
+    finally:
+        current_user.reset(token)
+
+
+def estimate_tokens(messages) -> int:
+    """Rough token count (words * 4/3) used for admission before the real usage is known."""
+    words = sum(count_tokens(m.content if isinstance(m.content, str) else json.dumps(m.content, default=str))
+                for m in messages)
+    return words * 4 // 3 + 1
+
+
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float):
+        i = next((i for i, bound in enumerate(self.BUCKETS_MS) if ms <= bound), len(self.BUCKETS_MS))
+        self.counts[i] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def _quantile(self, q: float):
+        """Upper bound of the bucket holding the q-quantile (None past the last bucket)."""
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= q * self.total:
+                return self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else None
+        return None
+
+    def summary(self) -> dict:
+        if not self.total:
+            return {"count": 0}
+        labels = [f"<={b}" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}"]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 1),
+            "p50_ms": self._quantile(0.5),
+            "p95_ms": self._quantile(0.95),
+            "buckets": {label: c for label, c in zip(labels, self.counts) if c},
+        }
+
+
+class LLMGateway:
+    """
+    Single entry point for every LLM call in the process.
+
+    - Identical concurrent requests (same messages and parameters) are coalesced: one
+      call goes to the model and every caller gets its result.
+    - At most max_concurrency calls run at once, and at most user_concurrency per user.
+    - Optional token budgets per rolling minute, for the process and per user.
+    - Waiting calls are admitted by priority (PRIORITY_CHAT before PRIORITY_BATCH), then FIFO.
+    - Token usage, latency and queue-wait histograms are kept per priority class.
+    """
+    def __init__(self, llm, max_concurrency: int = 8, user_concurrency: int = 2,
+                 tokens_per_minute: int = None, user_tokens_per_minute: int = None,
+                 queue_timeout: float = 300):
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.user_concurrency = user_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.user_tokens_per_minute = user_tokens_per_minute
+        self.queue_timeout = queue_timeout
+
+        self._cond = threading.Condition()
+        self._running = 0
+        self._running_by_user = defaultdict(int)
+        self._waiting = []
+        self._seq = itertools.count()
+        self._window = deque()   # [admitted_at, tokens, user] per call in the last minute
+
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        self._metrics = defaultdict(lambda: {
+            "calls": 0, "coalesced": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0,
+            "latency": Histogram(), "queue_wait": Histogram(),
+        })
+        self._metrics_lock = threading.Lock()
+
+    def chat_model(self, priority: int = PRIORITY_CHAT) -> "GatewayChatModel":
+        """A LangChain chat model whose calls go through this gateway at the given priority."""
+        return GatewayChatModel(gateway=self, priority=priority)
+
+    # --- Admission ---
+
+    def _window_tokens(self, now: float, user=None) -> int:
+        while self._window and now - self._window[0][0] > TOKEN_WINDOW_SECONDS:
+            self._window.popleft()
+        return sum(tokens for _, tokens, u in self._window if user is None or u == user)
+
+    def _admissible(self, ticket, now: float) -> bool:
+        _, _, user, tokens = ticket
+        if self._running >= self.max_concurrency:
+            return False
+        # .get: indexing the defaultdict would leave an entry for every user that only waited
+        if user is not None and self._running_by_user.get(user, 0) >= self.user_concurrency:
+            return False
+        # A request larger than the whole budget still runs once the window is empty
+        if self.tokens_per_minute:
+            used = self._window_tokens(now)
+            if used and used + tokens > self.tokens_per_minute:
+                return False
+        if self.user_tokens_per_minute and user is not None:
+            used = self._window_tokens(now, user)
+            if used and used + tokens > self.user_tokens_per_minute:
+                return False
+        return True
+
+    def _acquire(self, priority: int, user, tokens: int) -> list:
+        ticket = (priority, next(self._seq), user, tokens)
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    now = time.time()
+                    head = next((t for t in sorted(self._waiting) if self._admissible(t, now)), None)
+                    if head == ticket:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise GatewayBusyError(f"LLM request waited {self.queue_timeout:.0f}s for capacity")
+                    # Token budgets free up with time, not only when a call finishes
+                    self._cond.wait(timeout=min(remaining, 1.0))
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+            self._running += 1
+            self._running_by_user[user] += 1
+            reservation = [now, tokens, user]
+            self._window.append(reservation)
+            return reservation
+
+    def _release(self, user, reservation: list, actual_tokens: Optional[int]):
+        with self._cond:
+            self._running -= 1
+            self._running_by_user[user] -= 1
+            if not self._running_by_user[user]:
+                del self._running_by_user[user]
+            if actual_tokens is not None:
+                reservation[1] = actual_tokens
+            self._cond.notify_all()
+
+    # --- Calls ---
+
+    @staticmethod
+    def _request_key(messages, stop, kwargs) -> str:
+        body = [[m.type, m.content] for m in messages], stop, sorted(kwargs.items())
+        return hashlib.sha1(json.dumps(body, default=str).encode("utf-8")).hexdigest()
+
+    def _call(self, messages, priority: int, user, stop, kwargs):
+        metrics = self._metrics[PRIORITY_NAMES.get(priority, str(priority))]
+        estimate = estimate_tokens(messages)
+        queued = time.monotonic()
+        reservation = self._acquire(priority, user, estimate)
+        started = time.monotonic()
+        try:
+            message = self.llm.invoke(messages, stop=stop, **kwargs)
+        except Exception:
+            self._release(user, reservation, None)
+            with self._metrics_lock:
+                metrics["errors"] += 1
+            raise
+
+        # Charge the budget with the real usage when the model reports it
+        usage = getattr(message, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", estimate)
+        output_tokens = usage.get("output_tokens", estimate_tokens([message]))
+        self._release(user, reservation, input_tokens + output_tokens)
+
+        with self._metrics_lock:
+            metrics["calls"] += 1
+            metrics["input_tokens"] += input_tokens
+            metrics["output_tokens"] += output_tokens
+            metrics["queue_wait"].observe((started - queued) * 1000)
+            metrics["latency"].observe((time.monotonic() - started) * 1000)
+        return message
+
+    def invoke_messages(self, messages: List[BaseMessage], priority: int = PRIORITY_CHAT, stop=None, **kwargs):
+        """Runs one chat completion through coalescing and admission control; returns the AIMessage."""
+        key = self._request_key(messages, stop, kwargs)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            with self._metrics_lock:
+                self._metrics[PRIORITY_NAMES.get(priority, str(priority))]["coalesced"] += 1
+            return future.result()
+
+        try:
+            message = self._call(messages, priority, current_user.get(), stop, kwargs)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        future.set_result(message)
+        return message
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.time()
+            scheduler = {
+                "running": self._running,
+                "waiting": len(self._waiting),
+                "tokens_last_minute": self._window_tokens(now),
+                "users_running": len(self._running_by_user),
+            }
+        with self._metrics_lock:
+            classes = {
+                name: {**{k: v for k, v in m.items() if not isinstance(v, Histogram)},
+                       "latency": m["latency"].summary(), "queue_wait": m["queue_wait"].summary()}
+                for name, m in self._metrics.items()
+            }
+        return {**scheduler, "by_priority": classes}
+
+
+class GatewayChatModel(BaseChatModel):
+    """LangChain chat-model front end of an LLMGateway, usable anywhere get_llm() was."""
+    gateway: Any
+    priority: int = PRIORITY_CHAT
+
+    @property
+    def _llm_type(self) -> str:
+        return "llm-gateway"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        message = self.gateway.invoke_messages(messages, self.priority, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
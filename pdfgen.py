@@ -1,8 +1,11 @@
 import pandas as pd
 import json
 import re
+import hashlib
+import threading
 from io import BytesIO
-from collections import Counter
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer, PageBreak,
@@ -22,6 +25,52 @@ CODING_TOPICS = [
     "Array", "String", "Tree", "Graph", "DP", "Recursion", "Greedy", "Hashmap",
     "Stack", "Queue", "Linked List", "Heap", "Binary Search", "Matrix"
 ]
+# Phrases counted towards each topic, matched case-insensitively on word boundaries.
+TOPIC_SYNONYMS = {
+    "Array": ["array", "arrays", "subarray", "subarrays"],
+    "String": ["string", "strings", "substring", "substrings", "palindrome", "palindromes", "anagram", "anagrams"],
+    "Tree": ["tree", "trees", "binary tree", "binary trees", "bst", "binary search tree", "segment tree"],
+    "Graph": ["graph", "graphs", "bfs", "dfs", "dijkstra", "topological sort", "shortest path"],
+    "DP": ["dp", "dynamic programming", "memoization", "tabulation", "knapsack"],
+    "Recursion": ["recursion", "recursive", "backtracking"],
+    "Greedy": ["greedy"],
+    "Hashmap": ["hashmap", "hashmaps", "hash map", "hash maps", "hash table", "hashtable", "hashing", "hashset"],
+    "Stack": ["stack", "stacks", "monotonic stack"],
+    "Queue": ["queue", "queues", "deque"],
+    "Linked List": ["linked list", "linked lists", "linkedlist"],
+    "Heap": ["heap", "heaps", "priority queue", "min heap", "max heap"],
+    "Binary Search": ["binary search"],
+    "Matrix": ["matrix", "matrices", "grid", "2d array"],
+}
+TOPIC_LOOKUP = {phrase: topic for topic, phrases in TOPIC_SYNONYMS.items() for phrase in phrases}
+
+
+def _trie_pattern(phrases) -> str:
+    """
+    Regex alternation of the phrases factored into a character trie, so matching at a
+    position follows one branch instead of trying every phrase (a regex Aho-Corasick).
+    Optional suffixes are greedy, so the longest phrase wins ("binary search tree").
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node) -> str:
+        is_end = "" in node
+        branches = [(r"\s+" if ch == " " else re.escape(ch)) + render(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not is_end else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if is_end else body
+
+    return render(trie)
+
+
+TOPIC_PATTERN = re.compile(r"\b(?:" + _trie_pattern(TOPIC_LOOKUP) + r")\b", re.IGNORECASE)
 JOURNEY_PROMPT_TEMPLATE = """
 You are an expert interview coach. Analyze the provided candidate journeys.
 Return a single JSON object with keys: "summary_paragraph", "mistakes_to_avoid", and "key_tips".
@@ -42,34 +91,205 @@ Return a single JSON object with keys: "overview", "coding_questions", and "prob
 Round {round_index} data:
 {sample_data}
 """
+REPAIR_PROMPT_TEMPLATE = """
+Your previous answer could not be used: {errors}.
+Return only the corrected JSON object, with exactly the keys {keys} and no other text.
+
+Previous answer:
+{response}
+"""
+
+MERGE_PROMPT_TEMPLATE = """
+You are updating an interview insights report with newly collected interview experiences.
+Below is the current summary for {label} as JSON, followed by only the new experiences.
+Merge the new information in: keep every point of the current summary that still holds,
+add new patterns, questions and problem links, and update counts or durations if they changed.
+Return a single JSON object with exactly the keys {keys}.
+
+Current summary:
+{previous}
+
+New {label} data:
+{sample_data}
+"""
+
+# Expected shape of each section's JSON: key -> type (list values must hold strings).
+JOURNEY_SCHEMA = {"summary_paragraph": str, "mistakes_to_avoid": list, "key_tips": list}
+ROUND_SCHEMA = {"overview": str, "coding_questions": list, "problem_links": list}
+MAX_SECTION_ATTEMPTS = 3
+# Incrementally merged sections are re-summarized from scratch after this many merges to avoid drift.
+FULL_REBUILD_EVERY = 5
+
+
+def parse_section_json(text: str):
+    """Parses a JSON object from an LLM reply, tolerating code fences and surrounding prose."""
+    cleaned = re.sub(r"```(?:json)?", "", text).strip()
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        start, end = cleaned.find("{"), cleaned.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return json.loads(cleaned[start:end + 1])
+
+
+def validate_section(data, schema: dict) -> list:
+    """Returns the schema violations of a parsed section (empty when it is valid)."""
+    if not isinstance(data, dict):
+        return [f"expected a JSON object, got {type(data).__name__}"]
+    errors = []
+    for key, expected in schema.items():
+        if key not in data:
+            errors.append(f'missing key "{key}"')
+        elif not isinstance(data[key], expected):
+            errors.append(f'"{key}" must be a {"list" if expected is list else "string"}')
+        elif expected is list and not all(isinstance(item, str) for item in data[key]):
+            errors.append(f'"{key}" must be a list of strings')
+    return errors
+
+
+def topic_counts(df: pd.DataFrame) -> Counter:
+    """
+    Number of interviews mentioning each coding topic (synonyms included) in any round.
+    One regex pass per interview over its round columns, so this stays linear in the corpus.
+    """
+    round_cols = [c for c in df.columns if c.startswith('round_')]
+    if not round_cols or df.empty:
+        return Counter()
+    texts = df[round_cols[0]].fillna('').astype(str)
+    for col in round_cols[1:]:
+        texts = texts + ' ' + df[col].fillna('').astype(str)
+    matches = texts.reset_index(drop=True).str.findall(TOPIC_PATTERN).explode().dropna()
+    if matches.empty:
+        return Counter()
+    # Few distinct spellings actually occur, so normalize those once rather than per match
+    canonical = {m: TOPIC_LOOKUP[" ".join(m.lower().split())] for m in matches.unique()}
+    per_interview = pd.DataFrame({'interview': matches.index, 'topic': matches.map(canonical).values}).drop_duplicates()
+    return Counter(per_interview['topic'].value_counts().to_dict())
+
+
+def interview_ids(df: pd.DataFrame) -> list:
+    """Stable id per interview row: its URL when scraped with one, else a hash of its text."""
+    if 'url' in df.columns:
+        return df['url'].astype(str).tolist()
+    cols = [c for c in df.columns if c == 'journey' or c.startswith('round_')]
+    joined = df[cols].fillna('').astype(str).agg('\x1f'.join, axis=1)
+    return [hashlib.sha1(text.encode("utf-8")).hexdigest()[:16] for text in joined]
+
+
+# --- Shared Styles ---
+def _make_styles() -> dict:
+    """Paragraph styles shared by every report; built once per process."""
+    styles = getSampleStyleSheet()
+    return {
+        'CoverTitle': ParagraphStyle(name='CoverTitle', fontSize=28, alignment=TA_CENTER, spaceAfter=24, textColor=colors.HexColor('#004085')),
+        'CoverSubTitle': ParagraphStyle(name='CoverSubTitle', parent=styles['Normal'], fontSize=16, alignment=TA_CENTER, spaceAfter=12),
+        'CoverDate': ParagraphStyle(name='CoverDate', parent=styles['Normal'], fontSize=12, alignment=TA_CENTER, textColor=colors.grey),
+        'Title': ParagraphStyle(name='Title', parent=styles['h1'], fontSize=20, alignment=TA_CENTER, spaceAfter=12),
+        'Section': ParagraphStyle(name='Section', parent=styles['h2'], fontSize=16, leading=20, spaceAfter=12, textColor=colors.HexColor('#004085')),
+        'SubSection': ParagraphStyle(name='SubSection', parent=styles['h3'], fontSize=12, leading=16, spaceAfter=8, textColor=colors.black, fontName='Helvetica-Bold'),
+        'Body': ParagraphStyle(name='Body', parent=styles['Normal'], fontSize=11, leading=15, spaceAfter=12),
+        'Bullet': ParagraphStyle(name='Bullet', parent=styles['Normal'], fontSize=10, leading=14, leftIndent=18, spaceBefore=4),
+        'Link': ParagraphStyle(name='Link', fontSize=9, textColor=colors.blue, wordWrap='break-word'),
+    }
+
+
+STYLES = _make_styles()
+LINK_TABLE_STYLE = TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('GRID', (0,0), (-1,-1), 1, colors.black)])
+
+
+# --- Section Cache ---
+def section_key(prompt_template: str, texts: list, **kwargs) -> str:
+    """Content hash of one section's input: the prompt, its parameters and the source texts."""
+    digest = hashlib.sha1(prompt_template.encode("utf-8"))
+    digest.update(json.dumps(kwargs, sort_keys=True, default=str).encode("utf-8"))
+    for text in texts:
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SectionCache:
+    """
+    LLM summaries of report sections keyed by section_key(). A section whose input texts
+    did not change since the last report is rendered from here without calling the LLM.
+    """
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            data = self.entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: dict):
+        # Failed / empty summaries are not cached so the next build retries them
+        if not data:
+            return
+        with self._lock:
+            self.entries[key] = data
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+SECTION_CACHE = SectionCache()
+
 
 class PDFReportBuilder:
     """
     Builds a professional, multi-page PDF report with a cover page,
     headers, footers, and corrected styling.
+    Section summaries are fetched in parallel and reused from the section cache when
+    their input is unchanged, so a rebuild only pays for sections with new content.
+    Each summary is validated against its schema and only that section is re-asked on
+    failure. The manifest records every section's outcome; passing it to the next build
+    reuses the sections that succeeded.
+
+    In incremental mode the manifest also records which interviews each section covers.
+    When only new interviews were added, the section is refreshed by merging the previous
+    summary with just the new interviews' text, so the LLM input scales with the delta;
+    every full_rebuild_every merges it is summarized from scratch instead.
     """
-    def __init__(self, df: pd.DataFrame, llm, company_name: str, role_name: str):
+    def __init__(self, df: pd.DataFrame, llm, company_name: str, role_name: str,
+                 cache: SectionCache = None, max_workers: int = 4, thread_init=None,
+                 manifest: dict = None, max_attempts: int = MAX_SECTION_ATTEMPTS,
+                 incremental: bool = True, full_rebuild_every: int = FULL_REBUILD_EVERY):
         self.df = df
         self.llm = llm
         self.company_name = company_name
         self.role_name = role_name
+        self.cache = SECTION_CACHE if cache is None else cache
+        self.max_workers = max_workers
+        self.thread_init = thread_init
+        self.max_attempts = max_attempts
+        self.incremental = incremental
+        self.full_rebuild_every = full_rebuild_every
+        self.interview_ids = interview_ids(df)
+        self.manifest = {} if manifest is None else manifest
+        self.manifest.setdefault("sections", {})
         self.elements = []
+        self.rendered_sections = []
+        self.merged_sections = []
+        self.reused_sections = []
         self._init_styles()
 
     def _init_styles(self):
-        """Initializes and configures all necessary paragraph and table styles."""
-        styles = getSampleStyleSheet()
-        self.styles = {
-            'CoverTitle': ParagraphStyle(name='CoverTitle', fontSize=28, alignment=TA_CENTER, spaceAfter=24, textColor=colors.HexColor('#004085')),
-            'CoverSubTitle': ParagraphStyle(name='CoverSubTitle', parent=styles['Normal'], fontSize=16, alignment=TA_CENTER, spaceAfter=12),
-            'CoverDate': ParagraphStyle(name='CoverDate', parent=styles['Normal'], fontSize=12, alignment=TA_CENTER, textColor=colors.grey),
-            'Title': ParagraphStyle(name='Title', parent=styles['h1'], fontSize=20, alignment=TA_CENTER, spaceAfter=12),
-            'Section': ParagraphStyle(name='Section', parent=styles['h2'], fontSize=16, leading=20, spaceAfter=12, textColor=colors.HexColor('#004085')),
-            'SubSection': ParagraphStyle(name='SubSection', parent=styles['h3'], fontSize=12, leading=16, spaceAfter=8, textColor=colors.black, fontName='Helvetica-Bold'),
-            'Body': ParagraphStyle(name='Body', parent=styles['Normal'], fontSize=11, leading=15, spaceAfter=12),
-            'Bullet': ParagraphStyle(name='Bullet', parent=styles['Normal'], fontSize=10, leading=14, leftIndent=18, spaceBefore=4),
-            'Link': ParagraphStyle(name='Link', fontSize=9, textColor=colors.blue, wordWrap='break-word'),
-        }
+        """Uses the shared paragraph styles instead of rebuilding a stylesheet per report."""
+        self.styles = STYLES
         self.hr_line = HRFlowable(width="100%", thickness=1, color=colors.lightgrey, spaceBefore=10, spaceAfter=10)
 
     def _header_footer(self, canvas, doc):
@@ -84,29 +304,140 @@ class PDFReportBuilder:
         footer.drawOn(canvas, doc.leftMargin, h)
         canvas.restoreState()
 
-    def _get_llm_summary(self, prompt_template: str, column_data: pd.Series, **kwargs) -> dict:
-        """Invokes LLM and robustly parses the JSON response."""
-        texts = [str(c).strip() for c in column_data.dropna() if str(c).strip()]
-        if not texts: return {}
+    def _rows(self, col: str):
+        """(interview ids, texts) of the interviews with non-empty text in a column."""
+        ids, texts = [], []
+        for interview_id, value in zip(self.interview_ids, self.df[col]):
+            text = str(value).strip() if pd.notna(value) else ""
+            if text:
+                ids.append(interview_id)
+                texts.append(text)
+        return ids, texts
+
+    def _get_llm_summary(self, prompt_template: str, texts: list, schema: dict, **kwargs):
+        """
+        Invokes the LLM and validates the JSON reply against schema, asking it to repair
+        an invalid reply up to max_attempts times. Returns (data, attempts, error).
+        """
         sample_data = "\n---\n".join(texts)
-        prompt = prompt_template.format(sample_data=sample_data, **kwargs)
-        try:
-            response = self.llm.invoke(prompt.strip())
-            cleaned_response = re.sub(r"```json\n|```", "", response.content.strip())
-            return json.loads(cleaned_response)
-        except (json.JSONDecodeError, AttributeError) as e:
-            print(f"Warning: Could not parse LLM response. Error: {e}")
+        prompt = prompt_template.format(sample_data=sample_data, **kwargs).strip()
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = self.llm.invoke(prompt).content.strip()
+            except Exception as e:
+                error = f"LLM call failed: {e}"
+                continue
+            try:
+                data = parse_section_json(response)
+                errors = validate_section(data, schema)
+            except json.JSONDecodeError as e:
+                errors = [f"invalid JSON ({e})"]
+            if not errors:
+                return data, attempt, None
+            error = "; ".join(errors)
+            prompt = REPAIR_PROMPT_TEMPLATE.format(errors=error, keys=", ".join(schema), response=response).strip()
+        print(f"Warning: Could not get a valid section after {self.max_attempts} attempts. Error: {error}")
+        return {}, self.max_attempts, error
+
+    def _round_columns(self) -> list:
+        return sorted([c for c in self.df.columns if c.startswith('round_')], key=lambda x: int(x.split('_')[1]))
+
+    def _section_inputs(self) -> list:
+        """[(name, prompt_template, texts, kwargs, schema, interview_ids), ...] for every LLM-summarized section."""
+        ids, texts = self._rows('journey')
+        sections = [("journey", JOURNEY_PROMPT_TEMPLATE, texts, {}, JOURNEY_SCHEMA, ids)]
+        for col in self._round_columns():
+            idx = col.split('_')[1]
+            ids, texts = self._rows(col)
+            sections.append((col, ROUND_PROMPT_TEMPLATE, texts, {"round_index": idx}, ROUND_SCHEMA, ids))
+        return sections
+
+    def _new_interviews(self, previous, ids: list):
+        """
+        Interview ids to merge into the previous summary, or None when the section needs a
+        full summary (not incremental, nothing usable before, interviews removed, or due a rebuild).
+        """
+        if not self.incremental or not previous or previous["status"] != "ok" or "covered" not in previous:
+            return None
+        covered, current = set(previous["covered"]), set(ids)
+        if not covered <= current or previous.get("merges", 0) >= self.full_rebuild_every:
+            return None
+        return (current - covered) or None
+
+    def _merge_section(self, previous, texts, kwargs, schema, ids, new_ids):
+        """Merges only the new interviews' text into the previous summary."""
+        new_texts = [text for interview_id, text in zip(ids, texts) if interview_id in new_ids]
+        label = f"Round {kwargs['round_index']}" if "round_index" in kwargs else "the preparation journeys"
+        return self._get_llm_summary(MERGE_PROMPT_TEMPLATE, new_texts, schema, label=label,
+                                     keys=", ".join(schema), previous=json.dumps(previous["data"], indent=1))
+
+    def _summarize_section(self, name, prompt_template, texts, kwargs, schema, ids) -> dict:
+        if self.thread_init is not None:
+            self.thread_init()
+        key = section_key(prompt_template, texts, **kwargs)
+        previous = self.manifest["sections"].get(name)
+        if previous and previous["key"] == key and previous["status"] in ("ok", "empty"):
+            self.reused_sections.append(name)
+            return previous["data"]
+        if not texts:
+            self.manifest["sections"][name] = {"key": key, "status": "empty", "attempts": 0, "error": None, "data": {}}
             return {}
 
+        merges = 0
+        data = self.cache.get(key)
+        if data is not None:
+            self.reused_sections.append(name)
+            attempts, error = 0, None
+        else:
+            new_ids = self._new_interviews(previous, ids)
+            merged = self._merge_section(previous, texts, kwargs, schema, ids, new_ids) if new_ids else None
+            if merged and not merged[2]:
+                data, attempts, error = merged
+                merges = previous.get("merges", 0) + 1
+                self.merged_sections.append(name)
+            else:
+                # No usable previous summary, or the merge failed: summarize from scratch
+                data, attempts, error = self._get_llm_summary(prompt_template, texts, schema, **kwargs)
+                self.rendered_sections.append(name)
+            self.cache.put(key, data)
+        self.manifest["sections"][name] = {
+            "key": key, "status": "failed" if error else "ok", "attempts": attempts, "error": error, "data": data,
+            "covered": sorted(set(ids)), "merges": merges,
+        }
+        return data
+
+    @property
+    def failed_sections(self) -> list:
+        return [name for name, entry in self.manifest["sections"].items() if entry["status"] == "failed"]
+
+    def _summarize_sections(self) -> dict:
+        """Fetches all section summaries, changed sections in parallel. Returns {name: data}."""
+        sections = self._section_inputs()
+        workers = max(1, min(self.max_workers, len(sections)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda s: self._summarize_section(*s), sections)
+            summaries = {name: data for (name, *_), data in zip(sections, results)}
+        # Sections that no longer exist (e.g. fewer rounds after a rescrape) are dropped
+        for name in set(self.manifest["sections"]) - set(summaries):
+            del self.manifest["sections"][name]
+        return summaries
+
     def build_pdf(self) -> BytesIO:
         """Assembles all components into the final PDF document."""
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=inch, leftMargin=inch, topMargin=inch, bottomMargin=inch)
 
+        summaries = self._summarize_sections()
+        print(f"PDF sections: {len(self.rendered_sections)} regenerated, {len(self.merged_sections)} merged with new "
+              f"interviews, {len(self.reused_sections)} reused from cache.")
+        if self.failed_sections:
+            print(f"Warning: PDF sections without a valid summary: {', '.join(self.failed_sections)}")
+
         # Build document flowables in sequence
         self._build_cover_page()
-        self._build_journey_section()
-        self._build_rounds_sections()
+        self._build_journey_section(summaries.get("journey", {}))
+        self._build_rounds_sections(summaries)
         self._build_pie_chart_section()
 
         doc.build(self.elements, onFirstPage=self._header_footer, onLaterPages=self._header_footer)
@@ -122,11 +453,10 @@ class PDFReportBuilder:
         self.elements.append(Paragraph(f"Report Generated on: {datetime.now().strftime('%B %d, %Y')}", self.styles['CoverDate']))
         self.elements.append(PageBreak())
 
-    def _build_journey_section(self):
+    def _build_journey_section(self, data: dict):
         """Builds the 'Preparation Journey' section."""
         # FIX: The title is now INSIDE the list that will be kept together.
         section_content = [Paragraph('🧭 Preparation Journey', self.styles['Section'])]
-        data = self._get_llm_summary(JOURNEY_PROMPT_TEMPLATE, self.df['journey'])
 
         if summary := data.get("summary_paragraph"):
             section_content.append(Paragraph(summary, self.styles['Body']))
@@ -142,15 +472,14 @@ class PDFReportBuilder:
         self.elements.append(KeepTogether(section_content))
         self.elements.append(self.hr_line)
 
-    def _build_rounds_sections(self):
+    def _build_rounds_sections(self, summaries: dict):
         """Builds detailed sections for each interview round."""
-        round_cols = sorted([c for c in self.df.columns if c.startswith('round_')], key=lambda x: int(x.split('_')[1]))
-        for col in round_cols:
+        for col in self._round_columns():
             idx = col.split('_')[1]
 
             # FIX: The title is now INSIDE the list that will be kept together.
             section_content = [Paragraph(f'🧪 Round {idx} Overview', self.styles['Section'])]
-            data = self._get_llm_summary(ROUND_PROMPT_TEMPLATE, self.df[col], round_index=idx)
+            data = summaries.get(col, {})
 
             if overview := data.get("overview"):
                 section_content.append(Paragraph(overview, self.styles['Body']))
@@ -163,7 +492,7 @@ class PDFReportBuilder:
                 section_content.append(Paragraph('🔗 Problem Links:', self.styles['SubSection']))
                 table_data = [[Paragraph("Link to Online Problem", self.styles['SubSection'])]] + [[Paragraph(f'<a href="{link}">{link}</a>', self.styles['Link'])] for link in links]
                 tbl = Table(table_data, colWidths=['100%'], repeatRows=1)
-                tbl.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('GRID', (0,0), (-1,-1), 1, colors.black)]))
+                tbl.setStyle(LINK_TABLE_STYLE)
                 section_content.append(tbl)
 
             self.elements.append(KeepTogether(section_content))
@@ -175,8 +504,7 @@ class PDFReportBuilder:
         section_content = [Paragraph('📊 Coding Topic Distribution', self.styles['Section'])]
         section_content.append(Spacer(1, 0.9 * inch))
 
-        all_text = ' '.join(item.lower() for col in self.df.columns if col.startswith('round_') for item in self.df[col].dropna().astype(str))
-        counts = Counter(topic for topic in CODING_TOPICS if topic.lower() in all_text)
+        counts = topic_counts(self.df)
 
         if not counts:
             section_content.append(Paragraph("No relevant coding topics found.", self.styles['Body']))
@@ -199,7 +527,13 @@ class PDFReportBuilder:
         self.elements.append(KeepTogether(section_content))
 
 # --- Main Entry Point ---
-def build_pdf(df: pd.DataFrame, llm, company_name: str, role_name: str) -> BytesIO:
-    """Main entry point that your Streamlit app can call."""
-    builder = PDFReportBuilder(df, llm, company_name, role_name)
+def build_pdf(df: pd.DataFrame, llm, company_name: str, role_name: str,
+              cache: SectionCache = None, max_workers: int = 4, thread_init=None,
+              manifest: dict = None, incremental: bool = True) -> BytesIO:
+    """
+    Main entry point that your Streamlit app can call.
+    Pass the same manifest dict to the next build to regenerate only failed or changed sections.
+    """
+    builder = PDFReportBuilder(df, llm, company_name, role_name, cache=cache, max_workers=max_workers,
+                               thread_init=thread_init, manifest=manifest, incremental=incremental)
     return builder.build_pdf()
\ No newline at end of file
@@ -0,0 +1,288 @@
+import asyncio
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Heavy dependencies (LangChain, FAISS, Google GenAI, Selenium, ReportLab, pandas) are
+# imported inside the step that needs them, so starting the app or the service does not
+# pay for scraping or PDF code that a session may never use. Keep it that way:
+# importtime_check.py fails if any of them is imported at module level again.
+
+
+# flat (exact, default), ivfpq, hnsw or sq8 -- see vector_index.py
+INDEX_KIND = os.environ.get("INTBUDDY_INDEX_KIND", "flat")
+# Built retrievers are saved here per corpus version and reloaded instead of re-embedding ("" disables)
+INDEX_DIR = os.environ.get("INTBUDDY_INDEX_DIR", "index_store")
+
+_thread_state = threading.local()
+
+
+def ensure_event_loop():
+    """The Google GenAI clients need an event loop in whichever thread calls them."""
+    if getattr(_thread_state, "loop_ready", False):
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.set_event_loop(asyncio.new_event_loop())
+    _thread_state.loop_ready = True
+
+
+@lru_cache(maxsize=1)
+def get_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    ensure_event_loop()
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=0.3,
+        max_tokens=None,
+        timeout=None,
+        max_retries=2
+    )
+
+
+def _env_int(name: str, default=None):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+@lru_cache(maxsize=1)
+def get_gateway():
+    """Every LLM call (chat, history summaries, PDF sections) goes through this one gateway."""
+    from llm_gateway import LLMGateway
+
+    return LLMGateway(
+        get_llm(),
+        max_concurrency=_env_int("INTBUDDY_LLM_CONCURRENCY", 8),
+        user_concurrency=_env_int("INTBUDDY_LLM_USER_CONCURRENCY", 2),
+        tokens_per_minute=_env_int("INTBUDDY_LLM_TOKENS_PER_MINUTE"),
+        user_tokens_per_minute=_env_int("INTBUDDY_LLM_USER_TOKENS_PER_MINUTE"),
+    )
+
+
+def get_chat_llm():
+    from llm_gateway import PRIORITY_CHAT
+
+    return get_gateway().chat_model(PRIORITY_CHAT)
+
+
+def get_batch_llm():
+    from llm_gateway import PRIORITY_BATCH
+
+    return get_gateway().chat_model(PRIORITY_BATCH)
+
+
+@lru_cache(maxsize=1)
+def get_embeddings():
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    ensure_event_loop()
+    return GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+
+
+@lru_cache(maxsize=1)
+def get_answer_cache():
+    from answer_cache import SemanticAnswerCache
+
+    return SemanticAnswerCache(get_embeddings())
+
+
+@lru_cache(maxsize=1)
+def get_question_bank():
+    from question_bank import QuestionBank
+
+    return QuestionBank()
+
+
+class QAIndex:
+    """A built retriever + chain for one corpus, shared by every chat session over it."""
+    def __init__(self, chain, version: str, size: int, memory_bytes: int = 0, router=None, retriever=None):
+        self.chain = chain
+        self.retriever = retriever
+        self.router = router
+        self.version = version
+        self.size = size
+        self.memory_bytes = memory_bytes
+
+
+# --- Pipeline steps (no Streamlit; called from service workers) ---
+
+def scrape(company: str, role: str, pages: int, on_progress=None):
+    """
+    Runs every configured source (INTBUDDY_SOURCES, default code360 and GfG) concurrently
+    and returns the merged, near-deduplicated DataFrame (empty when nothing was found).
+    on_progress(message, current, total) receives the combined progress.
+    """
+    from sources import scrape_all
+
+    return scrape_all(company, role, pages, on_progress=on_progress)
+
+
+def build_index(df) -> QAIndex:
+    """Structures, chunks and embeds a scraped corpus and wires up the QA chain."""
+    from langchain.chains import ConversationalRetrievalChain
+    from answer_cache import corpus_version
+    from chunker import chunk_entries
+    from data_preprocessor import structure_dataframe, json_to_documents
+    from prompt import get_prompt
+    from query_router import CorpusTables, QueryRouter
+    from retriever import build_retriever, load_retriever, save_retriever
+    from vector_index import index_bytes
+
+    ensure_event_loop()
+    structured = structure_dataframe(df)
+    report = get_question_bank().add_entries(structured)
+    print(f"Question bank: stored {report['interviews']} interviews ({report['questions']} questions), "
+          f"{report['duplicates']} already present.")
+    records = chunk_entries(structured)
+    version = corpus_version(r['text'] for r in records)
+    folder = os.path.join(INDEX_DIR, f"{INDEX_KIND}-{version}") if INDEX_DIR else None
+    if folder and os.path.isdir(folder):
+        print(f"Loading saved index from {folder}")
+        retriever = load_retriever(folder, get_embeddings(), k=4)
+    else:
+        retriever = build_retriever(records, get_embeddings(), k=4, parents=json_to_documents(structured),
+                                    index_kind=INDEX_KIND)
+        if folder:
+            # Written to a scratch folder and renamed, so a half-written index is never loaded
+            scratch = f"{folder}.tmp-{os.getpid()}-{threading.get_ident()}"
+            try:
+                save_retriever(retriever, scratch)
+                os.replace(scratch, folder)
+            except OSError as e:
+                shutil.rmtree(scratch, ignore_errors=True)
+                print(f"Warning: Could not save index to {folder}. Error: {e}")
+    chain = ConversationalRetrievalChain.from_llm(
+        llm=get_chat_llm(),
+        retriever=retriever,
+        return_source_documents=True,
+        combine_docs_chain_kwargs={"prompt": get_prompt()}
+    )
+    # index codes + document text (kept by the docstore, BM25 and parents) as a rough footprint
+    memory_bytes = index_bytes(retriever.vectorstore.index) + 3 * sum(len(r['text']) for r in records)
+    return QAIndex(chain, version, len(df), memory_bytes,
+                   router=QueryRouter(CorpusTables(structured)), retriever=retriever)
+
+
+def new_history():
+    from history import ChatHistoryManager
+
+    return ChatHistoryManager(llm=get_chat_llm())
+
+
+def ask(index: QAIndex, question: str, history, user: str = None):
+    """
+    Answers one chat turn; returns (answer, cached) and records the turn in history.
+    LLM calls made for the turn count against user's share of the gateway.
+    """
+    # Counting / listing questions are answered from the structured tables without the LLM
+    if index.router is not None:
+        answer = index.router.route(question, history.pending + history.window)
+        if answer is not None:
+            history.add_turn(question, answer)
+            return answer, False
+
+    from llm_gateway import user_scope
+
+    ensure_event_loop()
+
+    def run_chain():
+        return index.chain({
+            "question": question,
+            "chat_history": history.for_chain(question)
+        })["answer"]
+
+    with user_scope(user):
+        answer, cached = get_answer_cache().get_or_compute(
+            index.version, question, history.pending + history.window, run_chain
+        )
+        history.add_turn(question, answer)
+    return answer, cached
+
+
+def llm_stats() -> dict:
+    """Gateway usage and latency, or {} before the first LLM call."""
+    if not get_gateway.cache_info().currsize:
+        return {}
+    return get_gateway().stats()
+
+
+def answer_cache_stats() -> dict:
+    """Semantic answer cache hit rate, or {} before the first cached lookup."""
+    if not get_answer_cache.cache_info().currsize:
+        return {}
+    return get_answer_cache().stats()
+
+
+def routing_stats() -> dict:
+    from query_router import ROUTING_STATS
+
+    return ROUTING_STATS.summary()
+
+
+# Section manifests of the last report per corpus key (company, role, pages): rebuilds redo
+# only failed or changed sections. One build per key at a time, as builds mutate the manifest.
+# Manifests hold every section's summary, so only the most recently used ones are kept.
+PDF_MANIFEST_LIMIT = int(os.environ.get("INTBUDDY_PDF_MANIFESTS", "32"))
+_pdf_manifests = OrderedDict()   # manifest key -> manifest, least recently used first
+_pdf_locks = {}                  # manifest key -> [lock, threads using it]; only keys in use
+_pdf_guard = threading.Lock()
+
+
+@contextmanager
+def _manifest(manifest_key, create: bool = True):
+    """
+    Holds manifest_key's lock and yields its manifest ({} when there is none and not create).
+    Idle manifests past PDF_MANIFEST_LIMIT are dropped, least recently used first.
+    """
+    with _pdf_guard:
+        entry = _pdf_locks.setdefault(manifest_key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            with _pdf_guard:
+                if create:
+                    _pdf_manifests.setdefault(manifest_key, {})
+                manifest = _pdf_manifests.get(manifest_key, {})
+                if manifest_key in _pdf_manifests:
+                    _pdf_manifests.move_to_end(manifest_key)
+            yield manifest
+    finally:
+        with _pdf_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _pdf_locks[manifest_key]
+            for key in [k for k in _pdf_manifests if k not in _pdf_locks]:
+                if len(_pdf_manifests) <= PDF_MANIFEST_LIMIT:
+                    break
+                del _pdf_manifests[key]
+
+
+def _failed(manifest: dict) -> list:
+    return [name for name, entry in manifest.get("sections", {}).items() if entry["status"] == "failed"]
+
+
+def generate_pdf(df, company: str, role: str, manifest_key=None):
+    """
+    Returns (pdf_bytes, failed_sections). manifest_key identifies the corpus whose
+    previous report is reused (default: company and role).
+    """
+    from parser import structure_df
+    from pdfgen import build_pdf
+
+    ensure_event_loop()
+    manifest_key = manifest_key or (company.strip().lower(), role.strip().lower())
+    final_struct = structure_df(df)
+    with _manifest(manifest_key) as manifest:
+        pdf = build_pdf(final_struct, get_batch_llm(), company, role, thread_init=ensure_event_loop, manifest=manifest)
+        return pdf.getvalue(), _failed(manifest)
+
+
+def pdf_failed_sections(manifest_key) -> list:
+    """Sections that failed in the last report built for manifest_key."""
+    with _manifest(manifest_key, create=False) as manifest:
+        return _failed(manifest)
@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+
+DEFAULT_DEMAND_LOG = os.environ.get("INTBUDDY_DEMAND_LOG", "demand_log.jsonl")
+
+
+def _key(company: str, role: str) -> tuple:
+    return " ".join(str(company).split()).lower(), " ".join(str(role).split()).lower()
+
+
+class DemandLog:
+    """
+    Exponentially decayed request counts per (company, role), appended to a JSONL file so
+    popularity survives restarts. A request counts 1 and halves in weight every half_life.
+    """
+    def __init__(self, path: str = DEFAULT_DEMAND_LOG, half_life_hours: float = 72):
+        self.path = path
+        self.half_life = half_life_hours * 3600
+        self.entries = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._apply(event)
+
+    def _decayed(self, value: float, since: float, now: float) -> float:
+        return value * 0.5 ** ((now - since) / self.half_life)
+
+    def _apply(self, event: dict):
+        key = _key(event["company"], event["role"])
+        now = event["ts"]
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = {"company": event["company"], "role": event["role"], "score": 0.0,
+                                         "pdf_score": 0.0, "updated": now, "pages": Counter()}
+        entry["score"] = self._decayed(entry["score"], entry["updated"], now)
+        entry["pdf_score"] = self._decayed(entry["pdf_score"], entry["updated"], now)
+        entry["updated"] = now
+        if event.get("kind") == "pdf":
+            entry["pdf_score"] += 1
+        else:
+            entry["score"] += 1
+        if event.get("pages"):
+            entry["pages"][int(event["pages"])] += 1
+
+    def record(self, company: str, role: str, pages: int = None, kind: str = "scrape"):
+        """Logs one request; kind is "scrape" (load & chat) or "pdf"."""
+        event = {"ts": time.time(), "company": company, "role": role, "pages": pages, "kind": kind}
+        with self.lock:
+            self._apply(event)
+            if self.path:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(event) + "\n")
+                except OSError as e:
+                    print(f"Warning: Could not write demand log. Error: {e}")
+
+    def top(self, n: int) -> list:
+        """The n most requested (company, role) pairs with their usual page count and PDF demand."""
+        now = time.time()
+        with self.lock:
+            ranked = [
+                {
+                    "company": e["company"],
+                    "role": e["role"],
+                    "pages": e["pages"].most_common(1)[0][0] if e["pages"] else 1,
+                    "score": self._decayed(e["score"], e["updated"], now),
+                    "pdf_score": self._decayed(e["pdf_score"], e["updated"], now),
+                }
+                for e in self.entries.values()
+            ]
+        ranked.sort(key=lambda e: e["score"] + e["pdf_score"], reverse=True)
+        return ranked[:n]
+
+
+class Prewarmer:
+    """
+    Background loop that keeps the corpus, QA index and (when reports are asked for)
+    the PDF of the top_n most requested (company, role) pairs built and fresh in the
+    Backend registries, so those lookups are served from cache.
+
+    Work is done one item at a time on a single thread and stops for the hour once
+    budget_seconds_per_hour of build time has been spent.
+    """
+    def __init__(self, backend, demand: DemandLog, top_n: int = 5, interval_seconds: float = 1800,
+                 refresh_seconds: float = 12 * 3600, budget_seconds_per_hour: float = 1200,
+                 min_pdf_score: float = 0.5):
+        self.backend = backend
+        self.demand = demand
+        self.top_n = top_n
+        self.interval_seconds = interval_seconds
+        self.refresh_seconds = refresh_seconds
+        self.budget_seconds_per_hour = budget_seconds_per_hour
+        self.min_pdf_score = min_pdf_score
+        self.spent = deque()   # (finished_at, seconds) per build step
+        self.warmed = 0
+        self.failures = 0
+        self.skipped_for_budget = 0
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="prewarmer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Prewarm cycle failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def _spent_last_hour(self) -> float:
+        now = time.time()
+        while self.spent and now - self.spent[0][0] > 3600:
+            self.spent.popleft()
+        return sum(seconds for _, seconds in self.spent)
+
+    def _step(self, fn, *args):
+        """Runs one build step, charging its wall time to the budget."""
+        started = time.time()
+        try:
+            return fn(*args)
+        finally:
+            self.spent.append((time.time(), time.time() - started))
+
+    def run_once(self):
+        from service import EmptyCorpusError
+
+        self.last_run = time.time()
+        for item in self.demand.top(self.top_n):
+            if self._stop.is_set():
+                return
+            if self._spent_last_hour() >= self.budget_seconds_per_hour:
+                self.skipped_for_budget += 1
+                continue
+            try:
+                corpus_key, corpus = self._step(self.backend.ensure_corpus, item["company"], item["role"],
+                                                item["pages"], None, self.refresh_seconds)
+                self._step(self.backend.ensure_index, corpus_key, corpus)
+                if item["pdf_score"] >= self.min_pdf_score:
+                    self._step(self.backend.ensure_pdf, corpus_key, corpus)
+                self.warmed += 1
+            except EmptyCorpusError:
+                continue
+            except Exception as e:
+                self.failures += 1
+                print(f"Prewarm failed for {item['company']} / {item['role']}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "top": [(e["company"], e["role"], round(e["score"], 2)) for e in self.demand.top(self.top_n)],
+            "warmed": self.warmed,
+            "failures": self.failures,
+            "skipped_for_budget": self.skipped_for_budget,
+            "spent_seconds_last_hour": round(self._spent_last_hour(), 1),
+            "budget_seconds_per_hour": self.budget_seconds_per_hour,
+            "last_run": self.last_run,
+        }
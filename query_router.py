@@ -0,0 +1,247 @@
+import re
+import threading
+from collections import Counter, defaultdict
+
+from answer_cache import is_context_dependent
+from question_bank import normalize_title
+from retriever import DIFFICULTY_ALIASES, ORDINALS
+
+# Questions asking for judgement or explanation always go to the RAG chain.
+OPEN_ENDED = re.compile(
+    r"\b(why|explain|describe|compare|suggest|recommend|advice|approach|prepare|preparation|"
+    r"experience|strategy|tips?|should|could|would|best way|how (?:to|do|did|can|should))\b"
+)
+# "for the LRU cache problem", "on graphs": a specific subject the aggregate tables cannot narrow to.
+SPECIFIC_SUBJECT = re.compile(
+    r"\b(?:for|of|about|on|related to)\s+(?!(?:the\s+|each\s+|all\s+|every\s+)?(?:round|rounds|interview|interviews|"
+    r"this|these|that|company|role|\d+|" + "|".join(ORDINALS) + r")\b)\w+"
+)
+ROUND_NUMBER = re.compile(r"\bround\s*(?:no\.?\s*)?(\d+)\b")
+ORDINAL_ROUND = re.compile(r"\b(" + "|".join(ORDINALS) + r")\s+round\b")
+DIFFICULTY_COUNT = re.compile(r"\bhow many (easy|moderate|medium|hard)\b")
+DIFFICULTY_WORD = re.compile(r"\b(easy|moderate|medium|hard)\b")
+TOP_N = re.compile(r"\btop\s+(\d+)\b")
+
+# Words any routable question may contain besides its rule's own terms and qualifiers.
+FILLER = frozenset("""
+    a an the in of for on from all every each any and are is was were there do does did me show list
+    give tell what which how many much most common commonly frequent frequently asked top number total
+    count this these that those interview interviews data corpus please overall typical typically usually
+""".split())
+
+# Per intent: the qualifiers its handler applies (round, difficulty, top_n) and the words
+# it understands. A question with any other qualifier or word is left to the RAG chain.
+INTENT_TERMS = {
+    "links": ({"round"}, {"links", "link", "urls", "problem", "problems", "question", "questions"}),
+    "round_count": (set(), {"rounds"}),
+    "interview_count": (set(), {"experiences", "candidates"}),
+    "difficulty": ({"round", "difficulty"}, {"difficulty", "difficulties", "questions", "problems", "ones",
+                                             "level", "levels", "breakdown", "distribution"}),
+    "top_topics": ({"top_n"}, {"topics"}),
+    "questions": ({"round", "top_n"}, {"questions", "problems", "coding"}),
+}
+
+
+class CorpusTables:
+    """
+    Aggregates precomputed from one corpus's structured interviews
+    (data_preprocessor.structure_dataframe output), used to answer counting and listing
+    questions exactly.
+    """
+    def __init__(self, entries: list):
+        self.interviews = len(entries)
+        self.round_counts = Counter()
+        self.questions = defaultdict(Counter)   # round number (0 = any) -> normalized title -> count
+        self.titles = {}                        # normalized title -> first title seen
+        self.links = defaultdict(dict)          # round number (0 = any) -> ordered set of links
+        self.difficulties = defaultdict(Counter)
+        self.topics = Counter()
+
+        for entry in entries:
+            rounds = entry.get("interview_rounds") or []
+            self.round_counts[len(rounds)] += 1
+            self.topics.update({t.strip() for t in entry.get("topics") or [] if t and t.strip()})
+            for r in rounds:
+                number = r.get("round_number")
+                for link in r.get("links") or []:
+                    self.links[number][link] = None
+                    self.links[0][link] = None
+                for q in r.get("questions", []):
+                    normalized = normalize_title(q.get("title", ""))
+                    if not normalized:
+                        continue
+                    self.titles.setdefault(normalized, q["title"].strip())
+                    self.questions[number][normalized] += 1
+                    self.questions[0][normalized] += 1
+                    difficulty = (q.get("difficulty") or "").lower()
+                    if difficulty in DIFFICULTY_ALIASES:
+                        self.difficulties[number][DIFFICULTY_ALIASES[difficulty]] += 1
+                        self.difficulties[0][DIFFICULTY_ALIASES[difficulty]] += 1
+
+
+def _round_number(text: str):
+    match = ROUND_NUMBER.search(text)
+    if match:
+        return int(match.group(1))
+    match = ORDINAL_ROUND.search(text)
+    return ORDINALS[match.group(1)] if match else None
+
+
+def _qualifiers(text: str):
+    """Rounds, difficulties and top-N counts mentioned in text, plus the text without them."""
+    found = {
+        "round": {int(n) for n in ROUND_NUMBER.findall(text)} | {ORDINALS[w] for w in ORDINAL_ROUND.findall(text)},
+        "difficulty": {DIFFICULTY_ALIASES[w] for w in DIFFICULTY_WORD.findall(text)},
+        "top_n": {int(n) for n in TOP_N.findall(text)},
+    }
+    for pattern in (ROUND_NUMBER, ORDINAL_ROUND, DIFFICULTY_WORD, TOP_N):
+        text = pattern.sub(" ", text)
+    return found, text
+
+
+def _answerable(intent: str, text: str) -> bool:
+    """True when the intent's handler uses every qualifier and word in the question."""
+    uses, words = INTENT_TERMS[intent]
+    found, rest = _qualifiers(text)
+    if any(len(values) > 1 for values in found.values()):
+        return False
+    if any(values and name not in uses for name, values in found.items()):
+        return False
+    return all(w in FILLER or w in words for w in re.findall(r"[a-z0-9]+", rest))
+
+
+def _top_n(text: str, default: int) -> int:
+    match = TOP_N.search(text)
+    return int(match.group(1)) if match else default
+
+
+def _in_round(round_number) -> str:
+    return f" in Round {round_number}" if round_number else ""
+
+
+class RoutingStats:
+    """Counts of questions answered from the structured tables vs. sent to the RAG chain."""
+    def __init__(self):
+        self.routed = Counter()
+        self.fallback = 0
+        self._lock = threading.Lock()
+
+    def record(self, intent):
+        with self._lock:
+            if intent:
+                self.routed[intent] += 1
+            else:
+                self.fallback += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            routed = sum(self.routed.values())
+            total = routed + self.fallback
+            return {
+                "questions": total,
+                "routed": routed,
+                "rag": self.fallback,
+                "routed_fraction": routed / total if total else 0.0,
+                "by_intent": dict(self.routed),
+            }
+
+
+ROUTING_STATS = RoutingStats()
+
+
+class QueryRouter:
+    """
+    Classifies a question with local regex rules. Counting/listing questions ("how many
+    rounds?", "list all problem links for round 2") are answered from CorpusTables;
+    route() returns None for everything else so the caller falls back to the RAG chain.
+    A question matching more than one rule is ambiguous and also goes to the chain, as is
+    one with a qualifier or subject the matched handler would ignore ("hard DP questions",
+    "topics in round 2"): a wrong table answer costs more than an LLM call.
+    """
+    def __init__(self, tables: CorpusTables, stats: RoutingStats = None, top_n: int = 10):
+        self.tables = tables
+        self.stats = ROUTING_STATS if stats is None else stats
+        self.top_n = top_n
+        self.rules = [
+            ("links", re.compile(r"\b(?:list|all|every|show)\b.*\b(?:links|urls)\b"), self._links),
+            ("round_count", re.compile(r"\bhow many (?:interview )?rounds\b|\bnumber of rounds\b"), self._round_count),
+            ("interview_count", re.compile(r"\bhow many (?:interviews|experiences|candidates)\b"), self._interview_count),
+            ("difficulty", re.compile(r"\bdifficult(?:y|ies)\b|" + DIFFICULTY_COUNT.pattern), self._difficulty),
+            ("top_topics", re.compile(r"\b(?:list|which|what|top|most (?:common|frequent|asked))\b.*\btopics\b"), self._topics),
+            ("questions", re.compile(r"\b(?:list|top|most (?:common|frequent|asked)|frequently asked)\b.*"
+                                     r"\b(?:questions|problems)\b"), self._questions),
+        ]
+
+    def classify(self, question: str):
+        """Returns the matching intent name, or None when the question needs the RAG chain."""
+        text = question.lower()
+        if OPEN_ENDED.search(text) or SPECIFIC_SUBJECT.search(text):
+            return None
+        matched = [intent for intent, pattern, _ in self.rules if pattern.search(text)]
+        if len(matched) != 1 or not _answerable(matched[0], text):
+            return None
+        return matched[0]
+
+    def route(self, question: str, chat_history=None):
+        """Answer from the structured tables, or None to fall back to the RAG chain."""
+        # Follow-ups ("list the links for those") depend on the conversation, not the tables
+        intent = None if is_context_dependent(question, chat_history) else self.classify(question)
+        answer = None
+        if intent is not None:
+            handler = next(h for name, _, h in self.rules if name == intent)
+            answer = handler(question.lower())
+        self.stats.record(intent if answer is not None else None)
+        return answer
+
+    # --- Handlers (return None when the tables cannot answer) ---
+
+    def _links(self, text: str):
+        round_number = _round_number(text)
+        links = list(self.tables.links.get(round_number or 0, {}))
+        if not links:
+            return None
+        lines = [f"🔗 Problem links{_in_round(round_number)} ({len(links)}):"]
+        lines += [f"- {link}" for link in links]
+        return "\n".join(lines)
+
+    def _round_count(self, text: str):
+        counts = {n: c for n, c in self.tables.round_counts.items() if n > 0}
+        if not counts:
+            return None
+        typical, _ = max(counts.items(), key=lambda item: (item[1], item[0]))
+        breakdown = ", ".join(f"{n} rounds: {c} interviews" for n, c in sorted(counts.items()))
+        return (f"📋 Most interviews had {typical} rounds (ranging from {min(counts)} to {max(counts)}).\n"
+                f"Breakdown across {sum(counts.values())} interviews: {breakdown}.")
+
+    def _interview_count(self, text: str):
+        if not self.tables.interviews:
+            return None
+        return f"📋 This data covers {self.tables.interviews} interview experiences."
+
+    def _difficulty(self, text: str):
+        round_number = _round_number(text)
+        counts = self.tables.difficulties.get(round_number or 0)
+        if not counts:
+            return None
+        asked = DIFFICULTY_WORD.search(text)
+        if asked:
+            difficulty = DIFFICULTY_ALIASES[asked.group(1)]
+            return f"📊 {counts.get(difficulty, 0)} {difficulty} questions{_in_round(round_number)}."
+        breakdown = ", ".join(f"{d}: {counts.get(d, 0)}" for d in ("easy", "moderate", "hard"))
+        return f"📊 Question difficulty{_in_round(round_number)}: {breakdown}."
+
+    def _topics(self, text: str):
+        if not self.tables.topics:
+            return None
+        lines = ["📚 Most common preparation topics:"]
+        lines += [f"- {topic} ({count})" for topic, count in self.tables.topics.most_common(_top_n(text, self.top_n))]
+        return "\n".join(lines)
+
+    def _questions(self, text: str):
+        round_number = _round_number(text)
+        counts = self.tables.questions.get(round_number or 0)
+        if not counts:
+            return None
+        lines = [f"🧩 Most asked questions{_in_round(round_number)}:"]
+        lines += [f"- {self.tables.titles[t]} (asked {c}x)" for t, c in counts.most_common(_top_n(text, self.top_n))]
+        return "\n".join(lines)
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH = os.environ.get("INTBUDDY_QUESTION_DB", "question_bank.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    company TEXT,
+    role TEXT,
+    application_method TEXT,
+    eligibility TEXT,
+    preparation_duration TEXT
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    interview_id INTEGER NOT NULL REFERENCES interviews(id) ON DELETE CASCADE,
+    round_number INTEGER,
+    mode TEXT,
+    duration TEXT
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    normalized_title TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS round_questions (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    question_id INTEGER NOT NULL REFERENCES questions(id),
+    difficulty TEXT,
+    approach TEXT
+);
+CREATE TABLE IF NOT EXISTS links (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    url TEXT NOT NULL
+);
+-- Maintained on insert so "most asked at <company>" is an index range scan.
+CREATE TABLE IF NOT EXISTS question_stats (
+    company TEXT NOT NULL,
+    role TEXT NOT NULL,
+    question_id INTEGER NOT NULL REFERENCES questions(id),
+    times_asked INTEGER NOT NULL DEFAULT 0,
+    easy INTEGER NOT NULL DEFAULT 0,
+    moderate INTEGER NOT NULL DEFAULT 0,
+    hard INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (company, role, question_id)
+);
+CREATE INDEX IF NOT EXISTS idx_interviews_company_role ON interviews(company, role);
+CREATE INDEX IF NOT EXISTS idx_rounds_interview ON rounds(interview_id, round_number);
+CREATE INDEX IF NOT EXISTS idx_round_questions_round ON round_questions(round_id);
+CREATE INDEX IF NOT EXISTS idx_round_questions_question ON round_questions(question_id);
+CREATE INDEX IF NOT EXISTS idx_links_round ON links(round_id);
+CREATE INDEX IF NOT EXISTS idx_question_stats_rank ON question_stats(company, role, times_asked DESC);
+CREATE INDEX IF NOT EXISTS idx_question_stats_company_rank ON question_stats(company, times_asked DESC);
+"""
+
+DIFFICULTIES = ("easy", "moderate", "hard")
+
+# Leading numbering ("1.", "Q2)") and trailing difficulty / platform tags, e.g. "(Easy)", "- LeetCode"
+TITLE_PREFIX = re.compile(r"^\s*(?:q(?:uestion)?\s*)?\d+\s*[.):-]\s*", re.IGNORECASE)
+TITLE_SUFFIX = re.compile(r"\s*[\(\[-]\s*(?:easy|moderate|medium|hard|leetcode|gfg|code360)\s*[\)\]]?\s*$", re.IGNORECASE)
+
+
+def normalize_title(title: str) -> str:
+    """Canonical form of a question title used to merge the same question across interviews."""
+    text = TITLE_SUFFIX.sub("", TITLE_PREFIX.sub("", title or ""))
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _key(value) -> str:
+    """Company / role key, normalized like service._normalize ("SDE-1" and "sde - 1" -> "sde 1")."""
+    return " ".join(str(value or "").replace("-", " ").split()).lower()
+
+
+def _role_clause(column: str, role: str):
+    """SQL matching a role key exactly or as a word prefix ("sde" matches "sde 1" and "sde 2")."""
+    key = _key(role)
+    prefix = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + " %"
+    return f"({column} = ? OR {column} LIKE ? ESCAPE '\\')", [key, prefix]
+
+
+def interview_fingerprint(entry) -> str:
+    """Identity of one interview experience; the same experience is only stored once."""
+    body = {
+        # Plain lowercase, not _key, so experiences stored before keys were normalized still match
+        "company": (entry.get("company") or "").strip().lower(),
+        "role": (entry.get("role") or "").strip().lower(),
+        "application_method": entry.get("application_method"),
+        "eligibility": entry.get("eligibility"),
+        "preparation_duration": entry.get("preparation_duration"),
+        # Notes only appear for free-text rounds, so other fingerprints are unchanged
+        "rounds": [
+            [r.get("round_number"), [normalize_title(q.get("title")) for q in r.get("questions", [])]]
+            + ([r.get("notes")] if r.get("notes") else [])
+            for r in entry.get("interview_rounds") or []
+        ],
+    }
+    return hashlib.sha1(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class QuestionBank:
+    """
+    Normalized SQLite store of structured interviews (data_preprocessor.structure_dataframe
+    output): interviews -> rounds -> questions / links. Questions are merged across
+    interviews by normalized title, and per (company, role) frequency and difficulty
+    counts are kept in an indexed table so "top questions" lookups never rescan interviews.
+    """
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            if path != ":memory:":
+                self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            self.conn.executescript(SCHEMA)
+            self._normalize_keys()
+
+    def _normalize_keys(self):
+        """Rewrites company / role keys stored before _key normalized them and rebuilds question_stats."""
+        self.conn.create_function("bank_key", 1, _key, deterministic=True)
+        updated = self.conn.execute(
+            "UPDATE interviews SET company = bank_key(company), role = bank_key(role) "
+            "WHERE company != bank_key(company) OR role != bank_key(role)"
+        ).rowcount
+        if not updated:
+            return
+        self.conn.execute("DELETE FROM question_stats")
+        self.conn.execute(
+            "INSERT INTO question_stats (company, role, question_id, times_asked, easy, moderate, hard) "
+            "SELECT i.company, i.role, rq.question_id, COUNT(*), SUM(rq.difficulty = 'easy'), "
+            "SUM(rq.difficulty = 'moderate'), SUM(rq.difficulty = 'hard') FROM round_questions rq "
+            "JOIN rounds r ON r.id = rq.round_id JOIN interviews i ON i.id = r.interview_id "
+            "GROUP BY i.company, i.role, rq.question_id"
+        )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # --- Ingestion ---
+
+    def _question_id(self, title: str):
+        normalized = normalize_title(title)
+        if not normalized:
+            return None
+        self.conn.execute("INSERT OR IGNORE INTO questions (normalized_title, title) VALUES (?, ?)",
+                          (normalized, title.strip()))
+        return self.conn.execute("SELECT id FROM questions WHERE normalized_title = ?", (normalized,)).fetchone()[0]
+
+    def _add_entry(self, entry) -> int:
+        """Inserts one interview; returns the number of question occurrences stored (-1 if already present)."""
+        company, role = _key(entry.get("company")), _key(entry.get("role"))
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO interviews (fingerprint, company, role, application_method, eligibility, "
+            "preparation_duration) VALUES (?, ?, ?, ?, ?, ?)",
+            (interview_fingerprint(entry), company, role, entry.get("application_method"),
+             entry.get("eligibility"), entry.get("preparation_duration")),
+        )
+        if cursor.rowcount == 0:
+            return -1
+        interview_id = cursor.lastrowid
+
+        stored = 0
+        for r in entry.get("interview_rounds") or []:
+            round_id = self.conn.execute(
+                "INSERT INTO rounds (interview_id, round_number, mode, duration) VALUES (?, ?, ?, ?)",
+                (interview_id, r.get("round_number"), r.get("mode"), r.get("duration")),
+            ).lastrowid
+            self.conn.executemany("INSERT INTO links (round_id, url) VALUES (?, ?)",
+                                  [(round_id, url) for url in dict.fromkeys(r.get("links") or [])])
+
+            seen = set()
+            for q in r.get("questions", []):
+                question_id = self._question_id(q.get("title", ""))
+                if question_id is None or question_id in seen:
+                    continue
+                seen.add(question_id)
+                difficulty = (q.get("difficulty") or "").strip().lower()
+                self.conn.execute(
+                    "INSERT INTO round_questions (round_id, question_id, difficulty, approach) VALUES (?, ?, ?, ?)",
+                    (round_id, question_id, difficulty or None, q.get("approach") or None),
+                )
+                self.conn.execute(
+                    "INSERT INTO question_stats (company, role, question_id, times_asked, easy, moderate, hard) "
+                    "VALUES (?, ?, ?, 1, ?, ?, ?) "
+                    "ON CONFLICT (company, role, question_id) DO UPDATE SET "
+                    "times_asked = times_asked + 1, easy = easy + excluded.easy, "
+                    "moderate = moderate + excluded.moderate, hard = hard + excluded.hard",
+                    (company, role, question_id, *(int(difficulty == d) for d in DIFFICULTIES)),
+                )
+                stored += 1
+        return stored
+
+    def add_entries(self, entries) -> dict:
+        """Stores structured interview entries in one transaction, skipping ones already stored."""
+        report = {"interviews": 0, "duplicates": 0, "questions": 0}
+        with self.lock, self.conn:
+            for entry in entries:
+                stored = self._add_entry(entry)
+                if stored < 0:
+                    report["duplicates"] += 1
+                else:
+                    report["interviews"] += 1
+                    report["questions"] += stored
+        return report
+
+    # --- Queries ---
+
+    def _query(self, sql: str, params=()) -> list:
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def top_questions(self, company: str, role: str = None, limit: int = 20) -> list:
+        """
+        Most frequently asked questions for a company (and role), with difficulty counts.
+        A role also matches the roles it prefixes ("SDE" covers SDE-1 and SDE-2).
+        """
+        where, params = "s.company = ?", [_key(company)]
+        if role:
+            clause, role_params = _role_clause("s.role", role)
+            where, params = f"{where} AND {clause}", params + role_params
+        return self._query(
+            "SELECT q.title, SUM(s.times_asked) AS times_asked, SUM(s.easy) AS easy, "
+            "SUM(s.moderate) AS moderate, SUM(s.hard) AS hard FROM question_stats s "
+            f"JOIN questions q ON q.id = s.question_id WHERE {where} "
+            "GROUP BY s.question_id ORDER BY times_asked DESC, q.title LIMIT ?",
+            params + [limit],
+        )
+
+    def difficulty_breakdown(self, company: str, role: str = None) -> dict:
+        """Question occurrences per difficulty for a company (and role)."""
+        where, params = "company = ?", [_key(company)]
+        if role:
+            clause, role_params = _role_clause("role", role)
+            where, params = f"{where} AND {clause}", params + role_params
+        return self._query(
+            f"SELECT COALESCE(SUM(easy), 0) AS easy, COALESCE(SUM(moderate), 0) AS moderate, "
+            f"COALESCE(SUM(hard), 0) AS hard FROM question_stats WHERE {where}",
+            params,
+        )[0]
+
+    def links(self, company: str, role: str = None, round_number: int = None) -> list:
+        """Distinct problem links for a company (and role / round)."""
+        sql = ("SELECT DISTINCT l.url FROM links l JOIN rounds r ON r.id = l.round_id "
+               "JOIN interviews i ON i.id = r.interview_id WHERE i.company = ?")
+        params = [_key(company)]
+        if role:
+            clause, role_params = _role_clause("i.role", role)
+            sql, params = f"{sql} AND {clause}", params + role_params
+        if round_number is not None:
+            sql, params = sql + " AND r.round_number = ?", params + [round_number]
+        return [row["url"] for row in self._query(sql + " ORDER BY l.url", params)]
+
+    def stats(self) -> dict:
+        counts = {}
+        with self.lock:
+            for table in ("interviews", "rounds", "questions", "round_questions", "links"):
+                counts[table] = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return counts
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the local question bank.")
+    parser.add_argument("company")
+    parser.add_argument("--role")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    bank = QuestionBank(args.db)
+    for i, row in enumerate(bank.top_questions(args.company, args.role, args.limit), 1):
+        print(f"{i:>3}. {row['title']}  x{row['times_asked']}  (easy {row['easy']}, moderate {row['moderate']}, hard {row['hard']})")
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def registry_id(key) -> str:
+    """Stable short id for a registry key, safe to hand out to clients."""
+    return hashlib.sha1(json.dumps(list(key), default=str).encode("utf-8")).hexdigest()[:16]
+
+
+class Registry:
+    """
+    Process-wide store of expensive shared objects (scraped corpora, QA indexes),
+    keyed by tuples such as (company, role, data version).
+
+    - get_or_build() is single-flight: concurrent callers for the same key share one build.
+    - Entries are reference counted; only unreferenced entries can be evicted.
+    - Unreferenced entries are evicted least-recently-used once the total estimated
+      size exceeds max_bytes, or once they are older than ttl_seconds.
+    """
+    def __init__(self, max_bytes: int, ttl_seconds: float = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.total_bytes = 0
+        self.builds = 0
+        self.shared_builds = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry["created"] > self.ttl_seconds
+
+    def _drop(self, key):
+        entry = self.entries.pop(key)
+        self.total_bytes -= entry["size"]
+        self.evictions += 1
+
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, e in self.entries.items() if e["refs"] == 0 and self._expired(e, now)]:
+            self._drop(key)
+        for key in list(self.entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if self.entries[key]["refs"] == 0:
+                self._drop(key)
+
+    def _lookup(self, key, acquire: bool):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry["refs"] == 0 and self._expired(entry, time.time()):
+            self._drop(key)
+            return None
+        self.entries.move_to_end(key)
+        if acquire:
+            entry["refs"] += 1
+        return entry
+
+    def get(self, key, acquire: bool = False):
+        with self.lock:
+            entry = self._lookup(key, acquire)
+            return entry["value"] if entry else None
+
+    def get_or_build(self, key, build, size_of=None, acquire: bool = False):
+        """Returns the value for key, building it at most once even under concurrent calls."""
+        with self.lock:
+            entry = self._lookup(key, acquire)
+            if entry:
+                return entry["value"]
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self.inflight[key] = Future()
+            else:
+                self.shared_builds += 1
+
+        if not leader:
+            value = future.result()
+            if acquire:
+                self.acquire(key)
+            return value
+
+        try:
+            value = build()
+        except Exception as e:
+            with self.lock:
+                del self.inflight[key]
+            future.set_exception(e)
+            raise
+
+        size = size_of(value) if size_of else 0
+        with self.lock:
+            self.entries[key] = {"value": value, "size": size, "refs": 1 if acquire else 0, "created": time.time()}
+            self.total_bytes += size
+            self.builds += 1
+            del self.inflight[key]
+            self._evict()
+        future.set_result(value)
+        return value
+
+    def refresh(self, key, build, size_of=None):
+        """
+        Rebuilds the value for key and swaps it in. Readers keep getting the old value
+        (and its references carry over) until the new one is ready.
+        """
+        value = build()
+        size = size_of(value) if size_of else 0
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old["size"]
+            self.entries[key] = {"value": value, "size": size, "refs": old["refs"] if old else 0, "created": time.time()}
+            self.total_bytes += size
+            self.builds += 1
+            self._evict()
+        return value
+
+    def age(self, key):
+        """Seconds since key's value was built, or None when it is not cached."""
+        with self.lock:
+            entry = self.entries.get(key)
+            return time.time() - entry["created"] if entry else None
+
+    def acquire(self, key) -> bool:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            entry["refs"] += 1
+            self.entries.move_to_end(key)
+            return True
+
+    def release(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry["refs"] > 0:
+                entry["refs"] -= 1
+            self._evict()
+
+    def discard(self, key):
+        """Drops an entry (e.g. a partial result) so the next get_or_build() rebuilds it."""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.total_bytes -= entry["size"]
+
+    def items(self) -> list:
+        """Snapshot of (key, value) pairs currently held."""
+        with self.lock:
+            return [(key, entry["value"]) for key, entry in self.entries.items()]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "inflight": len(self.inflight),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "builds": self.builds,
+                "shared_builds": self.shared_builds,
+                "evictions": self.evictions,
+            }
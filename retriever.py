@@ -0,0 +1,284 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import Field
+
+from bm25 import BM25Index
+from vector_index import build_vectorstore, load_vectorstore, search_params
+
+# Metadata fields (from data_preprocessor.document_metadata) that get an inverted index.
+FILTER_FIELDS = ("company", "role", "rounds", "difficulties", "topics")
+
+ORDINALS = {
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+    "sixth": 6, "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10,
+}
+# Filtered candidate sets up to this size are scored exactly from reconstructed vectors;
+# approximate indexes (HNSW, IVF) can otherwise miss most of a very selective filter.
+EXACT_CANDIDATE_LIMIT = 4096
+
+DIFFICULTY_ALIASES = {"easy": "easy", "moderate": "moderate", "medium": "moderate", "hard": "hard"}
+
+
+class MetadataIndex:
+    """
+    Inverted index over document metadata: field -> value -> set of document positions.
+    Positions are the order the documents were added to the vector store.
+    """
+    def __init__(self, metadatas: List[dict]):
+        self.size = len(metadatas)
+        self.postings = defaultdict(lambda: defaultdict(set))
+        for pos, meta in enumerate(metadatas):
+            for field in FILTER_FIELDS:
+                values = meta.get(field)
+                if values is None:
+                    continue
+                if not isinstance(values, (list, tuple, set)):
+                    values = [values]
+                for value in values:
+                    self.postings[field][value].add(pos)
+
+    def vocabulary(self, field: str) -> List[Any]:
+        return list(self.postings[field].keys())
+
+    def candidates(self, filters: Dict[str, list]) -> Optional[set]:
+        """
+        Returns the positions matching every field in filters (OR within a field,
+        AND across fields), or None when there is nothing to filter on.
+        """
+        result = None
+        for field, values in filters.items():
+            if not values:
+                continue
+            matched = set()
+            for value in values:
+                matched |= self.postings[field].get(value, set())
+            result = matched if result is None else result & matched
+        return result
+
+
+# Difficulty only narrows the search when it describes the questions ("hard DSA problems");
+# "how hard is round 2?" asks about the round as a whole.
+DIFFICULTY_FILTER = re.compile(r"\b(easy|moderate|medium|hard)\s+(?:\w+\s+)?(?:questions?|problems?|ones)\b")
+
+
+def _mentioned(query: str, index: MetadataIndex, field: str) -> list:
+    text = query.lower()
+    return [v for v in index.vocabulary(field)
+            if isinstance(v, str) and re.search(rf"(?<!\w){re.escape(v)}(?!\w)", text)]
+
+
+def parse_query_filters(query: str, index: MetadataIndex) -> Dict[str, list]:
+    """Extracts round, question difficulty, company and role filters mentioned in a question."""
+    text = query.lower()
+    filters = {}
+
+    rounds = {int(n) for n in re.findall(r"\bround\s*(?:no\.?\s*)?(\d+)", text)}
+    rounds |= {n for word, n in ORDINALS.items() if re.search(rf"\b{word}\s+round\b", text)}
+    if rounds:
+        filters["rounds"] = sorted(rounds)
+
+    difficulties = {DIFFICULTY_ALIASES[w] for w in DIFFICULTY_FILTER.findall(text)}
+    if difficulties:
+        filters["difficulties"] = sorted(difficulties)
+
+    for field in ("company", "role"):
+        mentioned = _mentioned(query, index, field)
+        if mentioned:
+            filters[field] = mentioned
+
+    return filters
+
+
+def parse_query_boosts(query: str, index: MetadataIndex) -> Dict[str, list]:
+    """
+    Topics mentioned in a question. They rank matching chunks higher instead of filtering:
+    the topics field holds the candidate's preparation topics, not what each round asked.
+    """
+    mentioned = _mentioned(query, index, "topics")
+    return {"topics": mentioned} if mentioned else {}
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[int]:
+    """Fuses several ranked lists of positions: score = sum of 1 / (k + rank)."""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, pos in enumerate(ranking, 1):
+            scores[pos] += 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+class RetrievalStats:
+    """Rolling per-query latency samples (milliseconds) for each retrieval phase."""
+    def __init__(self, window: int = 500):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, **timings_ms):
+        with self._lock:
+            self.samples.append(timings_ms)
+
+    def summary(self) -> dict:
+        # Chat threads keep recording while /stats reads
+        with self._lock:
+            samples = list(self.samples)
+        result = {}
+        phases = {phase for sample in samples for phase in sample}
+        for phase in sorted(phases):
+            values = sorted(s[phase] for s in samples if phase in s)
+            result[phase] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+            }
+        return result
+
+
+class FilteredRetriever(BaseRetriever):
+    """
+    Retriever that narrows the candidate set with the metadata inverted index
+    before running the FAISS search, so a "Round 2" question only scores Round 2 chunks.
+    Falls back to an unfiltered search when the filters match nothing.
+
+    With a BM25 index attached, vector and lexical rankings over the same candidate
+    set are fused with reciprocal-rank fusion, which handles exact-term lookups
+    ("links for the LRU cache problem") that embeddings alone rank poorly.
+    Chunks on a topic the question mentions get an extra vote in the same fusion.
+
+    When expand_parents is set, chunk hits are replaced by their full parent
+    interview (via the chunk's 'parent_id' metadata) for extra context.
+    """
+    vectorstore: Any
+    metadata_index: Any
+    k: int = 5
+    bm25: Optional[Any] = None
+    fetch_k: int = 20
+    rrf_k: int = 60
+    parents: Optional[List[str]] = None
+    expand_parents: bool = False
+    stats: Any = Field(default_factory=RetrievalStats)
+
+    def _vector_search(self, query: str, ids: Optional[set], n: int) -> List[int]:
+        vector = np.array([self.vectorstore.embeddings.embed_query(query)], dtype=np.float32)
+        if self.vectorstore._normalize_L2:
+            faiss.normalize_L2(vector)
+
+        if ids is not None and len(ids) <= EXACT_CANDIDATE_LIMIT:
+            candidates = np.fromiter(ids, dtype=np.int64, count=len(ids))
+            vectors = self.vectorstore.index.reconstruct_batch(candidates)
+            distances = ((vectors - vector) ** 2).sum(axis=1)
+            return candidates[np.argsort(distances)[:n]].tolist()
+
+        params = None
+        if ids is not None:
+            selector = faiss.IDSelectorBatch(np.fromiter(ids, dtype=np.int64, count=len(ids)))
+            params = search_params(self.vectorstore.index, selector)
+            n = min(n, len(ids))
+
+        _, indices = self.vectorstore.index.search(vector, n, params=params)
+        return [int(pos) for pos in indices[0] if pos != -1]
+
+    def _document(self, pos: int) -> Document:
+        return self.vectorstore.docstore.search(self.vectorstore.index_to_docstore_id[pos])
+
+    def _expand(self, docs: List[Document]) -> List[Document]:
+        expanded, seen = [], set()
+        for doc in docs:
+            parent_id = doc.metadata.get("parent_id")
+            if parent_id is None:
+                expanded.append(doc)
+            elif parent_id not in seen:
+                seen.add(parent_id)
+                expanded.append(Document(page_content=self.parents[parent_id], metadata=doc.metadata))
+        return expanded
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        start = time.perf_counter()
+        filters = parse_query_filters(query, self.metadata_index)
+        ids = self.metadata_index.candidates(filters)
+        if not ids:
+            ids = None
+        filtered = time.perf_counter()
+
+        boosted = self.metadata_index.candidates(parse_query_boosts(query, self.metadata_index))
+
+        fetch = max(self.k, self.fetch_k) if self.bm25 is not None or boosted else self.k
+        vector_hits = self._vector_search(query, ids, fetch)
+        searched = time.perf_counter()
+
+        rankings = [vector_hits]
+        if self.bm25 is not None:
+            rankings.append([pos for pos, _ in self.bm25.search(query, fetch, ids)])
+        if boosted:
+            # Hits on a mentioned topic get one more vote in the fusion
+            rankings.append([pos for pos in dict.fromkeys(vector_hits + rankings[-1]) if pos in boosted])
+        positions = reciprocal_rank_fusion(rankings, self.rrf_k)[:self.k] if len(rankings) > 1 else vector_hits[:self.k]
+        fused = time.perf_counter()
+
+        docs = [self._document(pos) for pos in positions]
+        if self.expand_parents and self.parents:
+            docs = self._expand(docs)
+
+        self.stats.record(
+            filter_ms=(filtered - start) * 1000,
+            vector_ms=(searched - filtered) * 1000,
+            lexical_ms=(fused - searched) * 1000,
+            total_ms=(time.perf_counter() - start) * 1000,
+        )
+        return docs
+
+
+def build_retriever(records: List[dict], embeddings, k: int = 5, parents: Optional[List[str]] = None,
+                    hybrid: bool = True, index_kind: str = "flat"):
+    """
+    Builds the FAISS store, metadata index and (if hybrid) BM25 index from json_to_records
+    (or chunker.chunk_entries) output and returns a FilteredRetriever over them.
+    index_kind is one of vector_index.INDEX_KINDS.
+    """
+    docs = [Document(page_content=r["text"], metadata=r["metadata"]) for r in records]
+    vs = build_vectorstore(docs, embeddings, kind=index_kind)
+    index = MetadataIndex([r["metadata"] for r in records])
+    bm25 = BM25Index.from_texts(r["text"] for r in records) if hybrid else None
+    return FilteredRetriever(vectorstore=vs, metadata_index=index, k=k, bm25=bm25, parents=parents)
+
+
+def save_retriever(retriever: FilteredRetriever, folder: str):
+    """Persists the FAISS index with the BM25 index and parent documents next to it."""
+    retriever.vectorstore.save_local(folder)
+    if retriever.bm25 is not None:
+        retriever.bm25.save(os.path.join(folder, "bm25.json"))
+    if retriever.parents is not None:
+        with open(os.path.join(folder, "parents.json"), "w", encoding="utf-8") as f:
+            json.dump(retriever.parents, f)
+
+
+def load_retriever(folder: str, embeddings, k: int = 5, mmap: bool = True) -> FilteredRetriever:
+    """
+    Loads a retriever saved with save_retriever (memory-mapping the FAISS index by default);
+    the metadata index is rebuilt from the docstore.
+    """
+    vs = load_vectorstore(folder, embeddings, mmap=mmap)
+    docs = [vs.docstore.search(vs.index_to_docstore_id[pos]) for pos in range(vs.index.ntotal)]
+    index = MetadataIndex([doc.metadata for doc in docs])
+
+    bm25_path = os.path.join(folder, "bm25.json")
+    bm25 = BM25Index.load(bm25_path) if os.path.exists(bm25_path) else None
+
+    parents = None
+    parents_path = os.path.join(folder, "parents.json")
+    if os.path.exists(parents_path):
+        with open(parents_path, encoding="utf-8") as f:
+            parents = json.load(f)
+
+    return FilteredRetriever(vectorstore=vs, metadata_index=index, k=k, bm25=bm25, parents=parents)
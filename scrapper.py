@@ -1,3 +1,5 @@
+import json
+import os
 import requests
 from bs4 import BeautifulSoup, NavigableString, Tag
 import re
@@ -124,6 +126,28 @@ def fetch_full_text(link):
         return f"Parsing error: {str(e)}"
 
 
+def to_description(content: str) -> str:
+    """
+    Rewrites fetch_full_text output in the layout data_preprocessor.clean_and_structure
+    reads: one "### Round N" block per <h3> round title, holding the round's text as
+    "Round notes" and its links as "🔗 Problem Links". Text without round titles
+    becomes a single round.
+    """
+    blocks = re.findall(r'<h3>(.*?)</h3>\n(.*?)(?=\n<h3>|\Z)', content, flags=re.DOTALL)
+    if not blocks:
+        blocks = [("", content)]
+
+    rounds = []
+    for n, (title, html) in enumerate(blocks, 1):
+        soup = BeautifulSoup(html, "html.parser")
+        text = re.sub(r'\s+', ' ', soup.get_text(separator=' ', strip=True))
+        notes = f"{title} {text}".strip()
+        links = [a["href"] for a in soup.find_all("a", href=True) if a["href"].startswith("http")]
+        rounds.append(f"### Round {n}\nRound notes\n{notes}\n"
+                      f"🔗 Problem Links: {', '.join(links) if links else 'null'}")
+    return "## Interview Preparation Journey\n## Interview Rounds\n" + "\n".join(rounds)
+
+
 def add_interview_experiences(df: pd.DataFrame) -> pd.DataFrame:
     """
     Given a DataFrame with a 'Link' column, scrape each URL
@@ -150,3 +174,80 @@ def add_interview_experiences(df: pd.DataFrame) -> pd.DataFrame:
     lambda x: BeautifulSoup(x, "html.parser").get_text(separator=' ', strip=True)
 )
     return df
+
+
+FETCH_ERRORS = ("Network error:", "Parsing error:", "Unexpected error:", "Content div not found")
+
+
+def _fetched_links(store_path) -> set:
+    """Links already in the JSONL store; a line cut off by a crash is ignored."""
+    links = set()
+    if store_path and os.path.exists(store_path):
+        with open(store_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    links.add(json.loads(line)["Link"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+    return links
+
+
+def read_store(store_path, links=None):
+    """Yields the records saved in a JSONL store (only those whose Link is in links, if given)."""
+    if not store_path or not os.path.exists(store_path):
+        return
+    with open(store_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if links is None or record.get("Link") in links:
+                yield record
+
+
+def stream_interview_experiences(df: pd.DataFrame, store_path=None, delay: float = 2, replay: bool = True):
+    """
+    Streaming, restartable version of add_interview_experiences. Yields one record per
+    link (the row's columns plus 'Interview_Experience' and, in to_description layout,
+    'Description') as soon as it is fetched, and appends it to the JSONL file at store_path first.
+
+    Links already in the store are not fetched again; with replay their saved records
+    are yielded before the new ones. Failed fetches are not saved or yielded, so they
+    are retried on the next run.
+    """
+    done = _fetched_links(store_path)
+    if replay and done:
+        yield from read_store(store_path, set(df["Link"]) & done)
+
+    pending = df[~df["Link"].isin(done)]
+    print(f"{len(done & set(df['Link']))} of {len(df)} links already fetched; fetching {len(pending)}.")
+    store = open(store_path, "a+", encoding="utf-8") if store_path else None
+    if store and store.tell():
+        # Start on a fresh line if the last run crashed mid-write
+        store.seek(store.tell() - 1)
+        if store.read(1) != "\n":
+            store.write("\n")
+    try:
+        for i, row in enumerate(pending.itertuples(index=False), 1):
+            record = row._asdict()
+            print(f"Fetching ({i}/{len(pending)}): {str(record.get('Title', 'N/A'))[:50]}...")
+            if i > 1:
+                time.sleep(delay)  # Be polite to the server
+            try:
+                content = fetch_full_text(record["Link"])
+            except Exception as e:
+                content = f"Unexpected error: {str(e)}"
+            if not content or content.startswith(FETCH_ERRORS):
+                print(f"  -> {content}")
+                continue
+
+            record["Interview_Experience"] = BeautifulSoup(content, "html.parser").get_text(separator=' ', strip=True)
+            record["Description"] = to_description(content)
+            if store:
+                store.write(json.dumps(record, default=str) + "\n")
+                store.flush()
+            yield record
+    finally:
+        if store:
+            store.close()
@@ -2,8 +2,7 @@ import pandas as pd
 import re
 import time
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from browser import new_driver, warm_up
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -21,7 +20,7 @@ def fetch_interview_links(company_to_filter, role_to_filter, pages_to_scrape):
     options.add_argument('--window-size=1920,1080')
     options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
     
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = new_driver(options)
     wait = WebDriverWait(driver, 15)
     all_results = []
 
@@ -91,7 +90,7 @@ def scrape_interview_details(url):
         options.add_argument('--window-size=1920,1080')
         options.add_argument('--log-level=3')
         options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        driver = new_driver(options)
 
         driver.get(url)
         time.sleep(7)
@@ -166,6 +165,8 @@ def main():
         print("Invalid number. Defaulting to 1 page.")
         pages_to_scrape = 1
 
+    warm_up()
+
     # --- Step 1: Fetch all the links first ---
     links_to_process = fetch_interview_links(company_to_filter, role_to_filter, pages_to_scrape)
 
@@ -0,0 +1,419 @@
+"""
+Headless HTTP service for the interview-insights pipeline.
+
+Scraping, index building and PDF generation run as background jobs that clients
+poll; chat answers run on a separate thread pool so the event loop stays free.
+
+    python service.py            # listens on $INTBUDDY_HOST:$INTBUDDY_PORT (0.0.0.0:8080)
+
+Endpoints:
+    POST /scrape   {"company", "role", "pages"}  -> 202 {"job_id"}   result: {"corpus_id", "count"}
+    POST /index    {"corpus_id", "session_id"}   -> 202 {"job_id"}   result: {"index_id", "count"}
+    POST /pdf      {"corpus_id"}                 -> 202 {"job_id"}   result: {"pdf_id", "failed_sections"}
+    GET  /jobs/{job_id}                          -> job status
+    POST /ask      {"index_id", "session_id", "question"} -> {"answer", "cached"}
+    DELETE /sessions/{session_id}
+    GET  /stats                                  -> registry sizes, builds, evictions, routed fraction, LLM usage
+    GET  /pdf/{pdf_id}                           -> application/pdf
+"""
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pipeline
+from prewarm import DemandLog, Prewarmer
+from registry import Registry, registry_id
+
+# Scraped corpora are reused across sessions for a day before being scraped again.
+CORPUS_TTL_SECONDS = 24 * 3600
+# Sessions that have not asked anything for this long release their references.
+SESSION_IDLE_SECONDS = 6 * 3600
+# Finished jobs stay pollable for this long, then are dropped.
+JOB_TTL_SECONDS = 3600
+
+
+class JobManager:
+    """
+    Runs pipeline steps on a thread pool and keeps their status for polling.
+    Finished jobs are forgotten ttl_seconds after they end.
+    """
+    def __init__(self, max_workers: int = 4, ttl_seconds: float = JOB_TTL_SECONDS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.ttl_seconds = ttl_seconds
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def _sweep(self):
+        now = time.time()
+        for job_id in [j for j, job in self.jobs.items()
+                       if job["finished"] is not None and now - job["finished"] > self.ttl_seconds]:
+            del self.jobs[job_id]
+
+    def submit(self, kind: str, fn, *args) -> dict:
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "pending",
+            "message": "",
+            "current": None,
+            "total": None,
+            "result": None,
+            "error": None,
+            "created": time.time(),
+            "finished": None,
+        }
+        with self.lock:
+            self._sweep()
+            self.jobs[job["id"]] = job
+
+        def progress(message, current=None, total=None):
+            job.update(message=message, current=current, total=total)
+
+        def run():
+            job["status"] = "running"
+            try:
+                job["result"] = fn(*args, progress)
+                job["status"] = "done"
+            except Exception as e:
+                print(f"Job {job['id']} ({kind}) failed: {e}")
+                job["error"] = str(e)
+                job["status"] = "failed"
+            finally:
+                job["finished"] = time.time()
+
+        self.executor.submit(run)
+        return job
+
+    def get(self, job_id: str):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+
+class EmptyCorpusError(Exception):
+    """Raised inside a scrape build so empty results are not cached in the registry."""
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).replace("-", " ").split()).lower()
+
+
+def _df_bytes(corpus: dict) -> int:
+    return int(corpus["df"].memory_usage(deep=True).sum())
+
+
+class Backend:
+    """
+    In-process state behind the HTTP API. Corpora, QA indexes and PDFs live in
+    process-wide registries keyed by (company, role, data version), so sessions asking
+    about the same company/role share one scrape, one index and one report.
+    Sessions hold references on what they use; unreferenced entries are LRU-evicted.
+
+    intbuddy2.py can also use this directly (client.LocalClient) when no service URL is configured.
+    """
+    def __init__(self, max_workers: int = 4, chat_workers: int = 8,
+                 corpus_mb: int = 256, index_mb: int = 1024, pdf_mb: int = 64,
+                 demand: DemandLog = None, prewarm_top_n: int = 0, prewarm_budget_seconds: float = 1200):
+        self.jobs = JobManager(max_workers=max_workers)
+        # Chat answers get their own pool so long scrapes never starve interactive requests.
+        self.chat_executor = ThreadPoolExecutor(max_workers=chat_workers)
+        self.corpora = Registry(corpus_mb * 1024 * 1024, ttl_seconds=CORPUS_TTL_SECONDS)
+        self.indexes = Registry(index_mb * 1024 * 1024)
+        self.pdfs = Registry(pdf_mb * 1024 * 1024)
+        # PDFs built with failed sections; asking again rebuilds just those sections.
+        self.incomplete_pdfs = set()
+        self.keys = {}
+        self.sessions = {}
+        self.lock = threading.Lock()
+        # (company, role) request counts; the prewarmer keeps the most requested ones built.
+        self.demand = DemandLog() if demand is None else demand
+        self.prewarmer = None
+        if prewarm_top_n > 0:
+            self.prewarmer = Prewarmer(self, self.demand, top_n=prewarm_top_n,
+                                       budget_seconds_per_hour=prewarm_budget_seconds)
+            self.prewarmer.start()
+
+    def _register(self, key) -> str:
+        public_id = registry_id(key)
+        with self.lock:
+            self.keys[public_id] = key
+        return public_id
+
+    def _corpus(self, corpus_id: str):
+        key = self.keys.get(corpus_id)
+        return self.corpora.get(key) if key else None
+
+    def has_corpus(self, corpus_id: str) -> bool:
+        return self._corpus(corpus_id) is not None
+
+    def has_index(self, index_id: str) -> bool:
+        key = self.keys.get(index_id)
+        return key is not None and self.indexes.get(key) is not None
+
+    # --- Sessions ---
+
+    def _session(self, session_id: str) -> dict:
+        with self.lock:
+            self._sweep_sessions()
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = self.sessions[session_id] = {"history": None, "history_index": None, "refs": set(),
+                                                       "last_used": time.time()}
+            session["last_used"] = time.time()
+            return session
+
+    def _hold(self, session_id: str, registry: Registry, key):
+        """Makes the session keep a reference on a registry entry until it ends."""
+        if not session_id:
+            return
+        session = self._session(session_id)
+        ref = (id(registry), key)
+        if ref not in session["refs"] and registry.acquire(key):
+            session["refs"].add(ref)
+
+    def _release_session(self, session):
+        registries = {id(r): r for r in (self.corpora, self.indexes, self.pdfs)}
+        for registry_key, key in session["refs"]:
+            registries[registry_key].release(key)
+
+    def _sweep_sessions(self):
+        now = time.time()
+        for session_id in [s for s, v in self.sessions.items() if now - v["last_used"] > SESSION_IDLE_SECONDS]:
+            self._release_session(self.sessions.pop(session_id))
+
+    # --- Builds (shared by jobs and the prewarmer) ---
+
+    def ensure_corpus(self, company: str, role: str, pages: int, progress=None, max_age: float = None):
+        """
+        Returns (key, corpus), scraping only when it is not cached. With max_age, a cached
+        corpus older than that is scraped again and swapped in once the new one is ready.
+        Raises EmptyCorpusError when the scrape finds nothing.
+        """
+        key = ("corpus", _normalize(company), _normalize(role), int(pages))
+
+        def scrape():
+            from answer_cache import corpus_version
+
+            df = pipeline.scrape(company, role, pages, on_progress=progress)
+            if df is None or df.empty:
+                raise EmptyCorpusError()
+            return {"df": df, "company": company, "role": role, "version": corpus_version(df['description'])}
+
+        age = self.corpora.age(key) if max_age is not None else None
+        if age is not None and age > max_age:
+            return key, self.corpora.refresh(key, scrape, size_of=_df_bytes)
+        return key, self.corpora.get_or_build(key, scrape, size_of=_df_bytes)
+
+    def ensure_index(self, corpus_key, corpus: dict):
+        key = ("index", corpus_key[1], corpus_key[2], corpus["version"])
+        self.indexes.get_or_build(key, lambda: pipeline.build_index(corpus["df"]),
+                                  size_of=lambda index: index.memory_bytes)
+        return key
+
+    def ensure_pdf(self, corpus_key, corpus: dict):
+        """Returns (key, failed_sections); a PDF built with failed sections is rebuilt on the next call."""
+        key = ("pdf", corpus_key[1], corpus_key[2], corpus["version"])
+        with self.lock:
+            if key in self.incomplete_pdfs:
+                self.pdfs.discard(key)
+
+        def build():
+            pdf, _ = pipeline.generate_pdf(corpus["df"], corpus["company"], corpus["role"], manifest_key=corpus_key)
+            return pdf
+
+        self.pdfs.get_or_build(key, build, size_of=len)
+        # Read from the shared manifest so callers that joined another caller's build see its failures too
+        failed = pipeline.pdf_failed_sections(corpus_key)
+        with self.lock:
+            if failed:
+                self.incomplete_pdfs.add(key)
+            else:
+                self.incomplete_pdfs.discard(key)
+        return key, failed
+
+    # --- Jobs ---
+
+    def start_scrape(self, company: str, role: str, pages: int) -> dict:
+        self.demand.record(company, role, pages)
+
+        def work(progress):
+            try:
+                key, corpus = self.ensure_corpus(company, role, pages, progress)
+            except EmptyCorpusError:
+                return {"corpus_id": None, "count": 0}
+            return {"corpus_id": self._register(key), "count": len(corpus["df"])}
+        return self.jobs.submit("scrape", work)
+
+    def start_index(self, corpus_id: str, session_id: str = None) -> dict:
+        corpus_key = self.keys[corpus_id]
+
+        def work(progress):
+            corpus = self.corpora.get(corpus_key)
+            if corpus is None:
+                raise KeyError(f"corpus {corpus_id} was evicted, scrape again")
+            self._hold(session_id, self.corpora, corpus_key)
+            progress("Embedding data and building chatbot...")
+            key = self.ensure_index(corpus_key, corpus)
+            self._hold(session_id, self.indexes, key)
+            if session_id:
+                # A (re)built chatbot starts a fresh conversation, as the app clears its chat
+                self._session(session_id).update(history=None, history_index=None)
+            return {"index_id": self._register(key), "count": len(corpus["df"])}
+        return self.jobs.submit("index", work)
+
+    def start_pdf(self, corpus_id: str) -> dict:
+        corpus_key = self.keys[corpus_id]
+
+        def work(progress):
+            corpus = self.corpora.get(corpus_key)
+            if corpus is None:
+                raise KeyError(f"corpus {corpus_id} was evicted, scrape again")
+            self.demand.record(corpus["company"], corpus["role"], corpus_key[3], kind="pdf")
+            progress("Generating PDF with summaries...")
+            key, failed = self.ensure_pdf(corpus_key, corpus)
+            return {"pdf_id": self._register(key), "failed_sections": failed}
+        return self.jobs.submit("pdf", work)
+
+    def job(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    # --- Chat & artifacts ---
+
+    def ask(self, index_id: str, session_id: str, question: str) -> dict:
+        key = self.keys[index_id]
+        index = self.indexes.get(key)
+        if index is None:
+            raise KeyError(f"index {index_id} was evicted, build it again")
+        self._hold(session_id, self.indexes, key)
+        session = self._session(session_id)
+        # History belongs to one index: turns about another company/role must not condense follow-ups
+        if session["history"] is None or session["history_index"] != key:
+            session.update(history=pipeline.new_history(), history_index=key)
+        answer, cached = pipeline.ask(index, question, session["history"], user=session_id)
+        return {"answer": answer, "cached": cached}
+
+    def end_session(self, session_id: str):
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+            if session:
+                self._release_session(session)
+
+    def pdf(self, pdf_id: str):
+        key = self.keys.get(pdf_id)
+        return self.pdfs.get(key) if key else None
+
+    def stats(self) -> dict:
+        return {
+            "corpora": self.corpora.stats(),
+            "indexes": self.indexes.stats(),
+            "retrieval": {
+                registry_id(key): {"company": key[1], "role": key[2], "latency_ms": index.retriever.stats.summary()}
+                for key, index in self.indexes.items() if getattr(index, "retriever", None) is not None
+            },
+            "pdfs": self.pdfs.stats(),
+            "sessions": len(self.sessions),
+            "routing": pipeline.routing_stats(),
+            "llm": pipeline.llm_stats(),
+            "answer_cache": pipeline.answer_cache_stats(),
+            "prewarm": self.prewarmer.stats() if self.prewarmer else None,
+        }
+
+
+# --- HTTP layer ---
+
+def _job_response(job: dict):
+    from aiohttp import web
+
+    return web.json_response({"job_id": job["id"]}, status=202)
+
+
+def _missing(what: str):
+    from aiohttp import web
+
+    return web.json_response({"error": f"unknown {what}"}, status=404)
+
+
+def create_app(backend: Backend = None):
+    # aiohttp is only needed when serving HTTP, not for the in-process LocalClient
+    from aiohttp import web
+
+    backend = backend or Backend(
+        max_workers=int(os.environ.get("INTBUDDY_WORKERS", "4")),
+        corpus_mb=int(os.environ.get("INTBUDDY_CORPUS_MB", "256")),
+        index_mb=int(os.environ.get("INTBUDDY_INDEX_MB", "1024")),
+        prewarm_top_n=int(os.environ.get("INTBUDDY_PREWARM_TOP_N", "5")),
+        prewarm_budget_seconds=float(os.environ.get("INTBUDDY_PREWARM_BUDGET_S", "1200")),
+    )
+    routes = web.RouteTableDef()
+
+    @routes.post("/scrape")
+    async def scrape(request):
+        body = await request.json()
+        job = backend.start_scrape(body["company"], body["role"], int(body.get("pages", 1)))
+        return _job_response(job)
+
+    @routes.post("/index")
+    async def index(request):
+        body = await request.json()
+        if not backend.has_corpus(body.get("corpus_id")):
+            return _missing("corpus")
+        return _job_response(backend.start_index(body["corpus_id"], body.get("session_id")))
+
+    @routes.post("/pdf")
+    async def pdf(request):
+        body = await request.json()
+        if not backend.has_corpus(body.get("corpus_id")):
+            return _missing("corpus")
+        return _job_response(backend.start_pdf(body["corpus_id"]))
+
+    @routes.get("/jobs/{job_id}")
+    async def job_status(request):
+        job = backend.job(request.match_info["job_id"])
+        return web.json_response(job) if job else _missing("job")
+
+    @routes.post("/ask")
+    async def ask(request):
+        body = await request.json()
+        if not body.get("session_id") or not body.get("question"):
+            return web.json_response({"error": "session_id and question are required"}, status=400)
+        if not backend.has_index(body.get("index_id")):
+            return _missing("index")
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            backend.chat_executor, backend.ask, body["index_id"], body["session_id"], body["question"]
+        )
+        return web.json_response(result)
+
+    @routes.get("/stats")
+    async def stats(request):
+        return web.json_response(backend.stats())
+
+    @routes.delete("/sessions/{session_id}")
+    async def end_session(request):
+        backend.end_session(request.match_info["session_id"])
+        return web.json_response({"ok": True})
+
+    @routes.get("/pdf/{pdf_id}")
+    async def pdf_bytes(request):
+        data = backend.pdf(request.match_info["pdf_id"])
+        if data is None:
+            return _missing("pdf")
+        return web.Response(body=data, content_type="application/pdf")
+
+    app = web.Application()
+    app.add_routes(routes)
+    app["backend"] = backend
+    return app
+
+
+if __name__ == "__main__":
+    from aiohttp import web
+
+    web.run_app(
+        create_app(),
+        host=os.environ.get("INTBUDDY_HOST", "0.0.0.0"),
+        port=int(os.environ.get("INTBUDDY_PORT", "8080")),
+    )
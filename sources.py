@@ -0,0 +1,212 @@
+import hashlib
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Every source yields records with these keys; "description" is what the rest of the
+# pipeline (data_preprocessor, dedup, pdfgen) reads.
+RECORD_FIELDS = ("company", "role", "description", "url", "title", "source")
+
+DEFAULT_SOURCES = os.environ.get("INTBUDDY_SOURCES", "code360,gfg")
+
+# Bounded sources (GfG) stop this long after every unbounded one (Code360) has finished,
+# so they add to the corpus without making a load wait on them.
+BOUNDED_GRACE_SECONDS = 10
+
+# GfG lists every experience for a company on one page; cap it like Code360's listing pages.
+GFG_LINKS_PER_PAGE = 10
+
+
+def _norm(text) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", str(text or "").lower()))
+
+
+def make_record(source: str, company, role, description, url=None, title=None) -> dict:
+    return {"company": company, "role": role, "description": description, "url": url,
+            "title": title, "source": source}
+
+
+class Source:
+    """
+    One place interview experiences come from. fetch() yields normalized records
+    (see make_record) as they are scraped and reports progress(message, current, total).
+    A bounded source stops early once stop (a threading.Event) is set.
+    """
+    name = "source"
+    bounded = False
+
+    def fetch(self, company: str, role: str, pages: int, progress=None, stop=None):
+        raise NotImplementedError
+
+
+class Code360Source(Source):
+    """naukri.com/code360 via code360.py (filtered listing, then HTTP or browser per interview)."""
+    name = "code360"
+
+    def __init__(self, max_workers: int = 5):
+        self.max_workers = max_workers
+
+    def fetch(self, company: str, role: str, pages: int, progress=None, stop=None):
+        import code360
+        from browser import warm_up
+
+        role_to_filter = re.sub(r'\s*-\s*', ' - ', role).upper()
+        warm_up()
+        links = code360.fetch_interview_links(company, role_to_filter, max(1, int(pages)))
+        if progress:
+            progress(f"Found {len(links)} interviews", 0, len(links))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(code360.scrape_link_wrapper, item, company, role): item for item in links}
+            for i, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                if progress:
+                    progress(f"Scraped {i}/{len(links)}", i, len(links))
+                if result:
+                    item = futures[future]
+                    yield make_record(self.name, result["company"], result["role"], result["description"],
+                                      url=item.get("url"), title=item.get("title"))
+
+
+class GfGSource(Source):
+    """
+    GeeksforGeeks company-wise experiences via scrapper.stream_interview_experiences.
+    Pages are fetched one at a time with a polite delay, so this source is bounded.
+    """
+    name = "gfg"
+    bounded = True
+
+    def __init__(self, delay_seconds: float = 2):
+        self.delay_seconds = delay_seconds
+
+    @staticmethod
+    def _matches_role(row, role: str) -> bool:
+        # GfG has no role field; the role is inferred from years of experience in the title
+        wanted = _norm(role)
+        return not wanted or wanted == _norm(row["Role"]) or wanted in _norm(row["Title"])
+
+    def fetch(self, company: str, role: str, pages: int, progress=None, stop=None):
+        from scrapper import get_company_interview_df, stream_interview_experiences, to_description
+
+        listing = get_company_interview_df(company)
+        if listing.empty:
+            return
+        listing = listing[listing.apply(self._matches_role, axis=1, role=role)]
+        listing = listing.head(max(1, int(pages)) * GFG_LINKS_PER_PAGE)
+        if progress:
+            progress(f"Found {len(listing)} interviews", 0, len(listing))
+
+        for i, row in enumerate(stream_interview_experiences(listing, delay=self.delay_seconds), 1):
+            if stop is not None and stop.is_set():
+                print(f"GfG: stopped after {i - 1}/{len(listing)} interviews (other sources finished).")
+                return
+            if progress:
+                progress(f"Scraped {i}/{len(listing)}", i, len(listing))
+            # Records stored before 'Description' existed only have the flattened text
+            description = row.get("Description") or to_description(row["Interview_Experience"])
+            # Rows were kept because they match the requested role, so record it rather than the guess
+            yield make_record(self.name, row["Company"], role or row["Role"], description,
+                              url=row["Link"], title=row["Title"])
+
+
+SOURCES = {"code360": Code360Source, "gfg": GfGSource}
+
+
+def get_sources(names: str = None) -> list:
+    """Source instances for a comma-separated list of names (default: INTBUDDY_SOURCES)."""
+    names = [n.strip().lower() for n in (names or DEFAULT_SOURCES).split(",") if n.strip()]
+    unknown = [n for n in names if n not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown sources {unknown}; available: {sorted(SOURCES)}")
+    return [SOURCES[n]() for n in names]
+
+
+_DONE = object()
+
+
+def stream_records(company: str, role: str, pages: int, sources=None, on_progress=None):
+    """
+    Runs every source concurrently, one thread each, and yields records as soon as any
+    source produces one. Exact repeats (same URL, or same normalized text) are dropped
+    here; near-duplicates are left to dedup.dedup_dataframe on the merged corpus.
+    A failing source is reported and skipped; the others keep going. Bounded sources are
+    stopped BOUNDED_GRACE_SECONDS after the last unbounded one finishes.
+    on_progress(message, current, total) gets combined progress across sources.
+    """
+    sources = get_sources() if sources is None else sources
+    records = queue.Queue()
+    status = {s.name: {"current": 0, "total": None, "records": 0} for s in sources}
+    lock = threading.Lock()
+    stop = threading.Event()
+    unbounded = [sum(not s.bounded for s in sources)]
+
+    def report(message):
+        if not on_progress:
+            return
+        with lock:
+            totals = [s["total"] for s in status.values()]
+            current = sum(s["current"] for s in status.values())
+            total = sum(totals) if all(t is not None for t in totals) else None
+            summary = ", ".join(f"{name}: {s['records']}" for name, s in status.items())
+        on_progress(f"{message} ({summary})", current, total)
+
+    def run(source):
+        def progress(message, current=None, total=None):
+            with lock:
+                status[source.name].update(current=current or 0, total=total)
+            report(f"{source.name}: {message}")
+
+        try:
+            for record in source.fetch(company, role, pages, progress, stop):
+                records.put(record)
+        except Exception as e:
+            print(f"Source {source.name} failed: {e}")
+        finally:
+            with lock:
+                # A finished source no longer holds back the combined total
+                status[source.name]["total"] = status[source.name]["current"]
+                if not source.bounded:
+                    unbounded[0] -= 1
+                    if not unbounded[0]:
+                        timer = threading.Timer(BOUNDED_GRACE_SECONDS, stop.set)
+                        timer.daemon = True
+                        timer.start()
+            records.put(_DONE)
+
+    threads = [threading.Thread(target=run, args=(s,), name=f"source-{s.name}", daemon=True) for s in sources]
+    for thread in threads:
+        thread.start()
+
+    seen_urls, seen_texts = set(), set()
+    running = len(threads)
+    while running:
+        record = records.get()
+        if record is _DONE:
+            running -= 1
+            continue
+        text_key = hashlib.sha1(_norm(record["description"]).encode("utf-8")).hexdigest()
+        if (record["url"] and record["url"] in seen_urls) or text_key in seen_texts:
+            continue
+        if record["url"]:
+            seen_urls.add(record["url"])
+        seen_texts.add(text_key)
+        with lock:
+            status[record["source"]]["records"] += 1
+        yield record
+
+    counts = ", ".join(f"{name}: {s['records']}" for name, s in status.items())
+    print(f"✅ Collected {len(seen_texts)} interviews ({counts}).")
+
+
+def scrape_all(company: str, role: str, pages: int, sources=None, on_progress=None):
+    """Collects stream_records into one near-deduplicated DataFrame (empty when nothing was found)."""
+    import pandas as pd
+    from dedup import dedup_dataframe
+
+    df = pd.DataFrame(list(stream_records(company, role, pages, sources, on_progress)), columns=RECORD_FIELDS)
+    if not df.empty:
+        df, report = dedup_dataframe(df)
+        print(f"Dedup: kept {report['output']}/{report['input']} experiences ({report['dedup_ratio']:.0%} near-duplicates).")
+    return df
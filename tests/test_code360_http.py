@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from code360_http import extract_from_dom, extract_from_state, extract_listing, fetch_interview_links_http, listing_url
+from data_preprocessor import clean_and_structure
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# --- extract_from_dom ---
+
+def test_dom_reads_journey_rounds_and_problem_links():
+    description = extract_from_dom(fixture("code360_dom_complete.html"))
+
+    assert description.startswith("## Interview Preparation Journey\n")
+    assert "## Interview Rounds" in description
+    assert "### Round 1\nOnline Coding Test" in description
+    assert "🔗 Problem Links: https://www.naukri.com/code360/problems/two-sum_839653" in description
+    assert "🔗 Problem Links: https://www.naukri.com/code360/problems/lru-cache_670276" in description
+    # A round without problems keeps the browser scraper's "null" marker
+    assert "### Round 3\nHR Round\nDuration: 20 minutes\nWhy Amazon?\n\n🔗 Problem Links: null" in description
+
+
+def test_dom_output_structures_like_the_browser_scraper():
+    entry = clean_and_structure(extract_from_dom(fixture("code360_dom_complete.html")))[0]
+
+    assert entry["application_method"] == "Campus"
+    assert entry["topics"] == ["Arrays", "DP", "Graphs"]
+    assert [r["round_number"] for r in entry["interview_rounds"]] == [1, 2, 3]
+    assert entry["interview_rounds"][1]["links"] == ["https://www.naukri.com/code360/problems/lru-cache_670276"]
+
+
+def test_dom_journey_without_rounds_is_incomplete():
+    assert extract_from_dom(fixture("code360_dom_journey_only.html")) is None
+
+
+def test_dom_problem_without_link_is_incomplete():
+    assert extract_from_dom(fixture("code360_dom_problem_without_link.html")) is None
+
+
+def test_dom_falls_back_to_blog_body():
+    page = '<html><body><div class="blog-body-content"><p>Round 1: DSA</p></div></body></html>'
+    assert extract_from_dom(page) == "Round 1: DSA"
+
+
+def test_dom_empty_page():
+    assert extract_from_dom("<html><body><codingninjas-root></codingninjas-root></body></html>") is None
+
+
+# --- extract_from_state ---
+
+def test_state_reads_escaped_transfer_state():
+    description = extract_from_state(fixture("code360_state.html"))
+
+    assert description.startswith("## Interview Preparation Journey\nWhere: Off campus\nTopics: Trees, Graphs")
+    assert "### Round 1\n" in description and "Course Schedule" in description
+    assert "🔗 Problem Links: https://www.naukri.com/code360/problems/course-schedule_1069243" in description
+    assert "### Round 2\n" in description and "System design of a URL shortener" in description
+
+
+def test_state_problems_without_links_are_incomplete():
+    assert extract_from_state(fixture("code360_state_problems_without_links.html")) is None
+
+
+def test_state_missing():
+    assert extract_from_state(fixture("code360_dom_complete.html")) is None
+
+
+# --- Listing pages ---
+
+def test_listing_url():
+    assert listing_url("Amazon", "SDE - 1") == "https://www.naukri.com/code360/interview-experiences/amazon?role=SDE+-+1"
+    assert listing_url("Goldman Sachs", "SDE - 1", 3).endswith("/goldman-sachs?role=SDE+-+1&page=3")
+
+
+def test_extract_listing_reads_cards_only():
+    assert extract_listing(fixture("code360_listing.html")) == [
+        {"title": "Amazon | SDE - 1",
+         "url": "https://www.naukri.com/code360/interview-experiences/amazon/amazon-sde-1-interview-1"},
+        {"title": "Amazon | SDE - 2",
+         "url": "https://www.naukri.com/code360/interview-experiences/amazon/amazon-sde-2-interview-2"},
+    ]
+
+
+@pytest.fixture
+def listing_pages(monkeypatch):
+    """Serves the listing fixture for pages 1-2 and an empty page after that."""
+    import code360_http
+
+    requested = []
+
+    def fetch_page(url, timeout=20):
+        requested.append(url)
+        return fixture("code360_listing.html") if "page=" not in url or "page=2" in url else "<html></html>"
+
+    monkeypatch.setattr(code360_http, "_fetch_page", fetch_page)
+    return requested
+
+
+def test_fetch_listing_filters_role_and_stops_at_empty_page(listing_pages):
+    links = fetch_interview_links_http("Amazon", "SDE - 1", 4)
+
+    assert len(listing_pages) == 4
+    # Both pages serve the same card, which is kept once; the SDE - 2 card is filtered out
+    assert [link["title"] for link in links] == ["Amazon | SDE - 1"]
+
+
+def test_fetch_listing_with_no_matching_cards_is_empty(listing_pages):
+    assert fetch_interview_links_http("Google", "SDE - 1", 1) == []
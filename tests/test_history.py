@@ -0,0 +1,37 @@
+from chunker import count_tokens
+from history import ChatHistoryManager
+
+
+def history_tokens(history: list) -> int:
+    return sum(count_tokens(m.content) if hasattr(m, "content") else count_tokens(m[0]) + count_tokens(m[1])
+               for m in history)
+
+
+def test_standalone_question_gets_no_history():
+    history = ChatHistoryManager()
+    history.add_turn("What rounds does Amazon have?", "Three rounds.")
+
+    assert history.for_chain("What rounds does Google have?") == []
+
+
+def test_one_long_turn_is_cut_to_the_budget():
+    history = ChatHistoryManager(token_budget=300)
+    history.add_turn("List all problem links", " ".join(f"https://example.com/p{i}" for i in range(2000)))
+
+    turns = history.for_chain("Which of those is the hardest?")
+
+    assert history_tokens(turns) <= 300
+    assert turns[-1][0] == "List all problem links"
+    assert turns[-1][1].endswith("…")
+
+
+def test_pending_turns_over_budget_are_summarized_first():
+    history = ChatHistoryManager(token_budget=300, summary_tokens=100, summarize_every=5)
+    history.add_turn("List all links", "link " * 400)
+    history.add_turn("And for round 2?", "link " * 400)
+    assert history.pending
+
+    turns = history.for_chain("Which of those are repeated?")
+
+    assert not history.pending
+    assert history_tokens(turns) <= 300
@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Any
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from llm_gateway import PRIORITY_BATCH, PRIORITY_CHAT, GatewayBusyError, LLMGateway, user_scope
+
+
+class GatedModel(FakeListChatModel):
+    """Fake model that records each prompt and blocks until gate is set."""
+    gate: Any = None
+    prompts: list = []
+
+    def invoke(self, input, config=None, **kwargs):
+        self.prompts.append(input[0].content if isinstance(input, list) else input)
+        self.gate.wait(timeout=5)
+        return super().invoke(input, config, **kwargs)
+
+
+def gated_model() -> GatedModel:
+    return GatedModel(responses=["ok"] * 100, gate=threading.Event(), prompts=[])
+
+
+def wait_until(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def start(target, *args) -> threading.Thread:
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_identical_concurrent_requests_are_coalesced():
+    model = gated_model()
+    gateway = LLMGateway(model)
+    chat = gateway.chat_model()
+    answers = []
+
+    threads = [start(lambda: answers.append(chat.invoke("same prompt").content))]
+    wait_until(lambda: gateway.stats()["running"] == 1)
+    threads += [start(lambda: answers.append(chat.invoke("same prompt").content)) for _ in range(4)]
+    wait_until(lambda: gateway.stats()["by_priority"]["chat"]["coalesced"] == 4)
+    model.gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert answers == ["ok"] * 5
+    assert model.prompts == ["same prompt"]
+
+
+def test_chat_is_admitted_before_queued_batch_calls():
+    model = gated_model()
+    gateway = LLMGateway(model, max_concurrency=1)
+    chat, batch = gateway.chat_model(PRIORITY_CHAT), gateway.chat_model(PRIORITY_BATCH)
+
+    threads = [start(batch.invoke, "batch 0")]
+    wait_until(lambda: gateway.stats()["running"] == 1)
+    for i, (model_, prompt) in enumerate([(batch, "batch 1"), (batch, "batch 2"), (chat, "chat")], 1):
+        threads.append(start(model_.invoke, prompt))
+        wait_until(lambda: gateway.stats()["waiting"] == i)
+    model.gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert model.prompts == ["batch 0", "chat", "batch 1", "batch 2"]
+
+
+def test_token_budget_holds_requests_until_the_window_frees():
+    model = FakeListChatModel(responses=["a b c"] * 10)
+    gateway = LLMGateway(model, tokens_per_minute=10, queue_timeout=0.3)
+    chat = gateway.chat_model()
+
+    chat.invoke("one two three four five")
+    with pytest.raises(GatewayBusyError):
+        chat.invoke("six seven eight nine ten eleven")
+    assert gateway.stats()["tokens_last_minute"] >= 10
+
+
+def test_timed_out_users_are_not_counted_as_running():
+    model = FakeListChatModel(responses=["a b c"] * 10)
+    gateway = LLMGateway(model, tokens_per_minute=10, queue_timeout=0.1)
+    chat = gateway.chat_model()
+
+    with user_scope("session-a"):
+        chat.invoke("one two three four five")
+    for i in range(3):
+        # Held back by the token budget, not by concurrency, until they time out
+        with user_scope(f"session-{i}"), pytest.raises(GatewayBusyError):
+            chat.invoke(f"waiting request number {i} with several more words")
+
+    assert gateway.stats()["users_running"] == 0
+    assert not gateway._running_by_user
@@ -0,0 +1,59 @@
+import pytest
+
+from data_preprocessor import _synthetic_interview, clean_and_structure
+from query_router import CorpusTables, QueryRouter, RoutingStats
+
+
+@pytest.fixture(scope="module")
+def router():
+    entries = [entry for i in range(20) for entry in clean_and_structure(_synthetic_interview(i))]
+    return QueryRouter(CorpusTables(entries), stats=RoutingStats())
+
+
+# --- Questions the tables answer ---
+
+@pytest.mark.parametrize("question, intent", [
+    ("How many rounds?", "round_count"),
+    ("How many interview rounds are there?", "round_count"),
+    ("How many interviews are in the data?", "interview_count"),
+    ("How many hard questions are in round 3?", "difficulty"),
+    ("What is the difficulty of round 1 questions?", "difficulty"),
+    ("List all problem links for round 2", "links"),
+    ("What are the most common topics?", "top_topics"),
+    ("List the most asked questions in round 2", "questions"),
+    ("Top 20 questions", "questions"),
+])
+def test_classifies_fully_answerable_questions(router, question, intent):
+    assert router.classify(question) == intent
+
+
+def test_difficulty_count_is_for_the_asked_round(router):
+    everywhere = sum(router.tables.difficulties[0].values())
+    answer = router.route("How many hard questions are in round 3?")
+
+    assert answer == f"📊 {router.tables.difficulties[3]['hard']} hard questions in Round 3."
+    assert router.tables.difficulties[3]["hard"] < everywhere
+
+
+def test_top_n_is_taken_from_the_question(router):
+    assert len(router.tables.questions[0]) > 20
+    answer = router.route("Top 20 questions")
+
+    assert len(answer.splitlines()) == 1 + 20
+
+
+# --- Questions with a qualifier or subject the handler would ignore ---
+
+@pytest.mark.parametrize("question", [
+    "How many hard DP questions?",
+    "How many rounds had a coding test?",
+    "how many rounds did the candidate who got rejected have?",
+    "What are the most common topics in round 2?",
+    "most asked questions in round 2 and round 3",
+    "How many hard questions and how many easy ones?",
+    "List the top questions and their difficulty",
+    "Most asked hard questions",
+])
+def test_partially_answerable_questions_go_to_the_chain(router, question):
+    assert router.classify(question) is None
+    assert router.route(question) is None
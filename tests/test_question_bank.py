@@ -0,0 +1,57 @@
+import sqlite3
+
+from data_preprocessor import _synthetic_interview, clean_and_structure
+from question_bank import QuestionBank
+
+
+def entries(company: str, role: str, n: int = 3, start: int = 0) -> list:
+    result = []
+    for i in range(start, start + n):
+        for entry in clean_and_structure(_synthetic_interview(i)):
+            entry["company"], entry["role"] = company, role
+            result.append(entry)
+    return result
+
+
+def test_role_spellings_share_one_key():
+    bank = QuestionBank(":memory:")
+    # Code360 stores roles as "SDE - 1"
+    bank.add_entries(entries("Amazon", "SDE - 1"))
+
+    assert bank.top_questions("Amazon", "SDE-1")
+    assert bank.top_questions("amazon ", "sde 1") == bank.top_questions("Amazon", "SDE-1")
+    assert bank.links("Amazon", "SDE-1")
+
+
+def test_role_prefix_covers_every_level():
+    bank = QuestionBank(":memory:")
+    bank.add_entries(entries("Amazon", "SDE - 1", start=0))
+    bank.add_entries(entries("Amazon", "SDE - 2", start=3))
+    bank.add_entries(entries("Amazon", "SDET", start=6))
+
+    total = sum(row["times_asked"] for row in bank.top_questions("Amazon", "SDE", limit=1000))
+    level_1 = sum(row["times_asked"] for row in bank.top_questions("Amazon", "SDE-1", limit=1000))
+    level_2 = sum(row["times_asked"] for row in bank.top_questions("Amazon", "SDE-2", limit=1000))
+
+    assert level_1 and level_2
+    assert total == level_1 + level_2   # "SDE" is not a prefix of "SDET"
+
+
+def test_keys_stored_before_normalization_are_rewritten(tmp_path):
+    path = str(tmp_path / "bank.sqlite3")
+    bank = QuestionBank(path)
+    bank.add_entries(entries("Amazon", "SDE-1"))
+    expected = bank.top_questions("Amazon", "SDE-1")
+    bank.close()
+
+    # What the old strip().lower() keys looked like on disk
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE interviews SET role = 'sde - 1'")
+        conn.execute("UPDATE question_stats SET role = 'sde - 1'")
+    conn.close()
+
+    bank = QuestionBank(path)
+    assert bank.top_questions("Amazon", "SDE-1") == expected
+    # The same experiences are still recognized as already stored
+    assert bank.add_entries(entries("Amazon", "SDE-1"))["duplicates"] == 3
@@ -0,0 +1,56 @@
+import time
+
+import sources
+from sources import Source, make_record, stream_records
+
+
+class FastSource(Source):
+    name = "fast"
+
+    def fetch(self, company, role, pages, progress=None, stop=None):
+        for i in range(3):
+            yield make_record(self.name, company, role, f"fast interview {i}", url=f"https://fast/{i}")
+
+
+class SlowSource(Source):
+    """Bounded like GfG: one interview every 50 ms, up to 200 of them."""
+    name = "slow"
+    bounded = True
+
+    def fetch(self, company, role, pages, progress=None, stop=None):
+        for i in range(200):
+            if stop is not None and stop.is_set():
+                return
+            time.sleep(0.05)
+            yield make_record(self.name, company, role, f"slow interview {i}", url=f"https://slow/{i}")
+
+
+def test_bounded_source_stops_after_the_others_finish(monkeypatch):
+    monkeypatch.setattr(sources, "BOUNDED_GRACE_SECONDS", 0.3)
+    start = time.monotonic()
+
+    records = list(stream_records("Amazon", "SDE-1", 1, sources=[FastSource(), SlowSource()]))
+
+    assert time.monotonic() - start < 2
+    by_source = [r["source"] for r in records]
+    assert by_source.count("fast") == 3
+    assert 0 < by_source.count("slow") < 200
+
+
+def test_bounded_source_alone_runs_to_completion(monkeypatch):
+    monkeypatch.setattr(sources, "BOUNDED_GRACE_SECONDS", 0)
+
+    class ShortSource(Source):
+        name = "short"
+        bounded = True
+
+        def fetch(self, company, role, pages, progress=None, stop=None):
+            for i in range(5):
+                time.sleep(0.01)
+                if stop.is_set():
+                    return
+                yield make_record(self.name, company, role, f"short interview {i}", url=f"https://short/{i}")
+
+    records = list(stream_records("Amazon", "SDE-1", 1, sources=[ShortSource()]))
+
+    assert len(records) == 5
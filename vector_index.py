@@ -0,0 +1,159 @@
+import math
+import os
+import pickle
+import time
+import uuid
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+
+# Supported index kinds. "flat" is the exact float32 baseline LangChain builds by default.
+INDEX_KINDS = ("flat", "ivfpq", "hnsw", "sq8")
+
+# PQ with 8-bit codes needs ~39 training points per centroid (256 * 39); smaller
+# corpora fall back to flat, which is fast enough at that size anyway.
+MIN_TRAIN_VECTORS = {"ivfpq": 256 * 39}
+
+
+def _pq_subquantizers(dim: int, target: int) -> int:
+    """Largest divisor of dim that is <= target (PQ needs dim % m == 0)."""
+    for m in range(min(target, dim), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def factory_string(kind: str, dim: int, n_vectors: int, nlist: int = None, pq_m: int = 64, hnsw_m: int = 32) -> str:
+    """faiss.index_factory description for an index kind sized for n_vectors."""
+    if kind == "flat":
+        return "Flat"
+    if kind == "sq8":
+        return "SQ8"
+    if kind == "hnsw":
+        return f"HNSW{hnsw_m}"
+    if kind == "ivfpq":
+        # ~4*sqrt(n) lists, but at least 39 training points per list
+        nlist = nlist or max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39))
+        return f"IVF{nlist},PQ{_pq_subquantizers(dim, pq_m)}x8"
+    raise ValueError(f"Unknown index kind '{kind}', expected one of {INDEX_KINDS}")
+
+
+def make_index(kind: str, vectors: np.ndarray, sample_size: int = 50000, nprobe: int = 16, ef_search: int = 64, **params):
+    """
+    Creates, trains (on a random sample of at most sample_size vectors) and fills a FAISS index.
+    Small corpora that cannot train IVF/PQ get a flat index instead.
+    """
+    n, dim = vectors.shape
+    if n < MIN_TRAIN_VECTORS.get(kind, 0):
+        print(f"Only {n} vectors; using a flat index instead of '{kind}'.")
+        kind = "flat"
+
+    index = faiss.index_factory(dim, factory_string(kind, dim, n, **params))
+    if not index.is_trained:
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)]
+        index.train(sample)
+    index.add(vectors)
+
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = nprobe
+        # lets filtered searches reconstruct candidate vectors by id
+        ivf.make_direct_map()
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
+    return index
+
+
+def search_params(index, selector=None):
+    """SearchParameters of the right subtype for the index, optionally restricted to a selector."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def build_vectorstore(docs, embeddings, kind: str = "flat", **params) -> FAISS:
+    """LangChain FAISS store over docs backed by the requested index kind."""
+    vectors = np.asarray(embeddings.embed_documents([d.page_content for d in docs]), dtype=np.float32)
+    index = make_index(kind, vectors, **params)
+    ids = [str(uuid.uuid4()) for _ in docs]
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, docs))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+
+
+def load_vectorstore(folder: str, embeddings, mmap: bool = True) -> FAISS:
+    """
+    Loads a store written by FAISS.save_local. With mmap the index file is memory-mapped
+    instead of read into RAM, so large quantized indexes load instantly and share pages
+    across worker processes.
+    """
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+    index = faiss.read_index(os.path.join(folder, "index.faiss"), flags)
+    with open(os.path.join(folder, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    return FAISS(embedding_function=embeddings, index=index, docstore=docstore,
+                 index_to_docstore_id=index_to_docstore_id)
+
+
+def index_bytes(index) -> int:
+    return int(faiss.serialize_index(index).size)
+
+
+def benchmark(vectors: np.ndarray, queries: np.ndarray, kinds=INDEX_KINDS, k: int = 10, **params) -> list:
+    """
+    Builds each index kind over vectors and reports recall@k against the exact flat
+    baseline, per-query latency and serialized size:
+    [{'kind', 'recall_at_k', 'mean_ms', 'p95_ms', 'bytes', 'build_s'}, ...]
+    """
+    baseline = make_index("flat", vectors)
+    _, truth = baseline.search(queries, k)
+
+    report = []
+    for kind in kinds:
+        start = time.perf_counter()
+        index = make_index(kind, vectors, **params)
+        build_s = time.perf_counter() - start
+
+        latencies, hits = [], 0
+        for i in range(len(queries)):
+            t0 = time.perf_counter()
+            _, found = index.search(queries[i:i + 1], k)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            hits += len(set(found[0]) & set(truth[i]))
+        latencies.sort()
+
+        report.append({
+            "kind": kind,
+            "recall_at_k": hits / (len(queries) * k),
+            "mean_ms": sum(latencies) / len(latencies),
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "bytes": index_bytes(index),
+            "build_s": build_s,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    # Synthetic archive-scale comparison: python vector_index.py [n_vectors] [dim]
+    import sys
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 768
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(256, dim)).astype(np.float32)
+    data = centers[rng.integers(0, 256, n)] + 0.3 * rng.normal(size=(n, dim)).astype(np.float32)
+    queries = data[rng.choice(n, 200, replace=False)] + 0.05 * rng.normal(size=(200, dim)).astype(np.float32)
+
+    print(f"{'kind':<8}{'recall@10':>10}{'mean ms':>10}{'p95 ms':>10}{'MB':>10}{'build s':>10}")
+    for row in benchmark(data, queries):
+        print(f"{row['kind']:<8}{row['recall_at_k']:>10.3f}{row['mean_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+              f"{row['bytes'] / 1e6:>10.1f}{row['build_s']:>10.1f}")